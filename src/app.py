@@ -10,7 +10,7 @@ warnings.filterwarnings("ignore", category=SyntaxWarning, module="newspaper")
 import os
 import sys
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from contextlib import asynccontextmanager
 
 import json
@@ -38,6 +38,9 @@ from firebase_service import get_firebase_service, FirebaseService
 
 
 # --- REQUEST/RESPONSE MODELS ---
+# Trust boundary: request bodies are validated by FastAPI. Response models are
+# filled from our own data (Firebase, the agent) and built with
+# model_construct, since FastAPI checks them against response_model anyway.
 
 class ChatRequest(BaseModel):
     """Request body for chat endpoint."""
@@ -143,15 +146,12 @@ class FirebaseChatSession:
         
         # Load conversation history from Firebase
         messages = self.firebase.get_messages(self.session_id)
-        conversation_history = [
-            {"role": m["role"], "content": m["content"]} 
-            for m in messages
-        ]
         
         # Create a temporary ChatSession (in-memory) with the history loaded
-        # We use the raw ChatSession logic but inject history
-        temp_session = ChatSession()
-        temp_session.conversation_history = conversation_history
+        # We use the raw ChatSession logic but inject history; the setter
+        # keeps only role/content of the recent window, so no copy is needed
+        temp_session = ChatSession(session_id=self.session_id)
+        temp_session.conversation_history = messages
         
         # Stream events
         final_answer = ""
@@ -229,7 +229,7 @@ async def health_check():
     return {
         "status": "healthy",
         "firebase": firebase_status,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
 
@@ -243,9 +243,9 @@ async def create_session():
         session_id = firebase.create_session()
         logger.info("session_created", session_id=session_id)
         
-        return CreateSessionResponse(
+        return CreateSessionResponse.model_construct(
             session_id=session_id,
-            created_at=datetime.utcnow().isoformat()
+            created_at=datetime.now(timezone.utc).isoformat()
         )
     except Exception as e:
         logger.error("session_creation_failed", error=str(e))
@@ -265,7 +265,7 @@ async def get_session(session_id: str):
         
         messages = session.get("messages", [])
         
-        return SessionResponse(
+        return SessionResponse.model_construct(
             session_id=session_id,
             created_at=session.get("created_at").isoformat() if session.get("created_at") else None,
             updated_at=session.get("updated_at").isoformat() if session.get("updated_at") else None,
@@ -341,7 +341,7 @@ async def chat(request: ChatRequest):
         chat_session = FirebaseChatSession(request.session_id, firebase)
         result = chat_session.chat(request.message)
         
-        return ChatResponse(
+        return ChatResponse.model_construct(
             session_id=request.session_id,
             answer=result["answer"],
             citations=result["citations"],
@@ -9,6 +9,8 @@ Structure:
     ├── __init__.py      - Public exports
     ├── schemas.py       - Pydantic models (AgentState, AgentPlan, etc.)
     ├── llm.py           - LLM configuration (get_llm)
+    ├── llm_cache.py     - On-disk cache for LLM responses
+    ├── history.py       - Conversation history formatting
     ├── nodes/           - Graph nodes
     │   ├── planner.py   - Planning node
     │   ├── executor.py  - Tool execution node
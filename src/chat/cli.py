@@ -2,6 +2,9 @@
 Interactive CLI for the chat agent.
 """
 
+import sys
+from typing import Callable
+
 import structlog
 
 from .session import ChatSession
@@ -10,10 +13,48 @@ from utils import setup_logging
 logger = structlog.get_logger()
 
 
+# --- COMMANDS ---
+# Each handler returns True when the chat loop should exit.
+
+def _cmd_quit(session: ChatSession) -> bool:
+    print("\n👋 Goodbye!")
+    return True
+
+
+def _cmd_clear(session: ChatSession) -> bool:
+    session.clear_history()
+    print("🧹 Conversation history cleared.")
+    return False
+
+
+def _cmd_history(session: ChatSession) -> bool:
+    history = session.get_history()
+    if not history:
+        print("📜 No conversation history yet.")
+    else:
+        print("\n📜 Conversation History:")
+        for msg in history:
+            role = {"user": "You", "system": "Earlier"}.get(msg['role'], "Bot")
+            print(f"  [{role}]: {msg['content'][:100]}{'...' if len(msg['content']) > 100 else ''}")
+        print()
+    return False
+
+
+_COMMANDS: dict[str, Callable[[ChatSession], bool]] = {
+    "/quit": _cmd_quit,
+    "/clear": _cmd_clear,
+    "/history": _cmd_history,
+}
+
+
 def start_chat():
     """Start an interactive chat session."""
     # Ensure logging is set up if running standalone
     setup_logging()
+
+    # Write streamed tokens straight through to the terminal
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=False, write_through=True)
     
     session = ChatSession()
     
@@ -35,31 +76,25 @@ def start_chat():
                 continue
             
             # Handle commands
-            if user_input.lower() == '/quit':
-                print("\n👋 Goodbye!")
-                break
-            
-            elif user_input.lower() == '/clear':
-                session.clear_history()
-                print("🧹 Conversation history cleared.")
-                continue
-            
-            elif user_input.lower() == '/history':
-                history = session.get_history()
-                if not history:
-                    print("📜 No conversation history yet.")
-                else:
-                    print("\n📜 Conversation History:")
-                    for i, msg in enumerate(history):
-                        role = "You" if msg['role'] == 'user' else "Bot"
-                        print(f"  [{role}]: {msg['content'][:100]}{'...' if len(msg['content']) > 100 else ''}")
-                    print()
+            handler = _COMMANDS.get(user_input.lower())
+            if handler:
+                if handler(session):
+                    break
                 continue
             
-            # Regular chat
-            response = session.chat(user_input)
+            # Regular chat: print answer tokens as they arrive
+            print("\n🤖 Assistant: ", end="", flush=True)
+            streamed = False
+            response = None
+            for event in session.chat_stream(user_input, stream_tokens=True):
+                if event["type"] == "token":
+                    print(event["content"], end="", flush=True)
+                    streamed = True
+                elif event["type"] == "result":
+                    response = event
             
-            print(f"\n🤖 Assistant: {response['answer']}")
+            # Structured and planner answers are not streamed
+            print("" if streamed else response['answer'])
             
             if response['citations']:
                 print(f"\n📚 Sources ({len(response['citations'])}):")
@@ -15,13 +15,17 @@ logger = structlog.get_logger()
 
 def should_search(state: AgentState) -> str:
     """
-    Decides whether to go to Executor or straight to Synthesizer.
-    Returns 'search' if plan has queries, 'skip' otherwise.
+    Decides where to go after the Planner.
+    Returns 'search' if plan has queries, 'done' if the planner already
+    answered (greetings, refusals), 'synthesize' otherwise.
     """
-    if not state.get('plan'):
-        logger.info("skip_search")
-        return "skip"
-    return "search"
+    if state.get('plan'):
+        return "search"
+    if state.get('final_answer'):
+        logger.info("planner_answered")
+        return "done"
+    logger.info("skip_search")
+    return "synthesize"
 
 
 # --- BUILD THE GRAPH ---
@@ -42,7 +46,8 @@ workflow.add_conditional_edges(
     should_search,
     {
         "search": "executor",
-        "skip": "synthesizer"
+        "synthesize": "synthesizer",
+        "done": END
     }
 )
 
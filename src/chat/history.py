@@ -0,0 +1,63 @@
+"""
+Conversation history formatting shared by the graph nodes.
+"""
+
+# Number of earlier user questions listed in the "earlier" summary line
+_EARLIER_TOPICS = 5
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    """Cut text to max_chars, marking the cut with an ellipsis."""
+    return text if len(text) <= max_chars else text[:max_chars].rstrip() + "…"
+
+
+def summarize_turns(turn_count: int, questions: list[str]) -> str:
+    """One-line summary of earlier turns, listing their last few questions."""
+    topics = "; ".join(_truncate(q, 60) for q in questions[-_EARLIER_TOPICS:])
+    return f"…earlier: {turn_count} turns about {topics}"
+
+
+def format_conversation_history(
+    history: list[dict],
+    max_turns: int = 6,
+    max_chars_per_msg: int = 400
+) -> str:
+    """
+    Format conversation history for prompt context.
+
+    Keeps the last `max_turns` user/assistant pairs and folds anything older
+    into one summary line, so prompt size stays bounded as the conversation
+    grows. Messages are cut to `max_chars_per_msg`, except the latest turn,
+    which is kept whole (it may hold an email draft awaiting confirmation).
+    "system" messages (summaries of already-compacted turns) come first,
+    verbatim.
+
+    Args:
+        history: Messages as [{"role": "user/assistant/system", "content": "..."}].
+        max_turns: Number of recent turns to keep.
+        max_chars_per_msg: Maximum characters kept per message.
+
+    Returns:
+        Formatted history string, or "" if there is no history.
+    """
+    if not history:
+        return ""
+
+    formatted = [m['content'] for m in history if m['role'] == 'system']
+    history = [m for m in history if m['role'] != 'system']
+
+    keep = max_turns * 2
+    earlier = history[:-keep] if len(history) > keep else []
+    recent = history[-keep:]
+
+    if earlier:
+        questions = [m['content'] for m in earlier if m['role'] == 'user']
+        formatted.append(summarize_turns(len(earlier) // 2, questions))
+
+    last_turn_start = len(recent) - 2
+    for i, msg in enumerate(recent):
+        role = "User" if msg['role'] == 'user' else "Assistant"
+        content = msg['content'] if i >= last_turn_start else _truncate(msg['content'], max_chars_per_msg)
+        formatted.append(f"{role}: {content}")
+
+    return "\n".join(formatted)
@@ -2,22 +2,43 @@
 LLM configuration for the chat agent.
 """
 
+import functools
 import os
 
+import httpx
 from langchain_openai import ChatOpenAI
 
+MODEL_NAME = "google/gemini-3-flash-preview"
+
+# Shared HTTP/2 clients: concurrent LLM calls multiplex over pooled
+# connections instead of paying a TLS handshake per request.
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+_http_client = httpx.Client(http2=True, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+_http_async_client = httpx.AsyncClient(http2=True, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+
+
+@functools.lru_cache(maxsize=1)
+def _build_llm(api_key: str | None) -> ChatOpenAI:
+    """Build the OpenRouter client; cached so turns reuse one instance."""
+    return ChatOpenAI(
+        model=MODEL_NAME,
+        temperature=0,
+        api_key=api_key,
+        base_url="https://openrouter.ai/api/v1",
+        http_client=_http_client,
+        http_async_client=_http_async_client
+    )
+
 
 def get_llm():
     """
     Lazy initialization of the LLM using OpenRouter.
     
+    The instance is cached per API key, so repeated calls share one client
+    (and its HTTP connection pool).
+    
     Returns:
         ChatOpenAI instance configured for OpenRouter.
     """
-    api_key = os.getenv("OPENROUTER_API_KEY")
-    return ChatOpenAI(
-        model="google/gemini-3-flash-preview", 
-        temperature=0,
-        api_key=api_key,
-        base_url="https://openrouter.ai/api/v1"
-    )
+    return _build_llm(os.getenv("OPENROUTER_API_KEY"))
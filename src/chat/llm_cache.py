@@ -0,0 +1,91 @@
+"""
+On-disk cache for deterministic LLM calls.
+"""
+
+import hashlib
+import json
+
+import structlog
+
+from utils import get_disk_cache
+from .llm import MODEL_NAME
+
+logger = structlog.get_logger()
+
+# Cached responses expire after a week so the cache stays bounded
+CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+# Bump when the cached value format or the prompt layout changes, so
+# entries written by older code are never returned
+CACHE_VERSION = 1
+
+# Output-schema digest per runnable, by id: (runnable, digest). The planner
+# and synthesizer runnables are long-lived, so this stays a handful of entries.
+_RUNNABLE_DIGESTS: dict[int, tuple[object, str]] = {}
+
+
+def _runnable_digest(runnable) -> str:
+    """SHA-256 of the runnable's output schema (e.g. the AgentPlan model)."""
+    hit = _RUNNABLE_DIGESTS.get(id(runnable))
+    if hit is None or hit[0] is not runnable:
+        schema = json.dumps(runnable.get_output_jsonschema(), sort_keys=True, default=str)
+        hit = (runnable, hashlib.sha256(schema.encode("utf-8")).hexdigest())
+        _RUNNABLE_DIGESTS[id(runnable)] = hit
+    return hit[1]
+
+
+def _cache_key(runnable, messages: list) -> str:
+    """
+    SHA-256 of the cache version, model, the runnable's output schema and
+    the full message list (prompt included).
+    """
+    payload = json.dumps(
+        {
+            "version": CACHE_VERSION,
+            "model": MODEL_NAME,
+            "schema": _runnable_digest(runnable),
+            "messages": [(m.type, m.content) for m in messages],
+        },
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cached_invoke(runnable, messages: list, namespace: str, **kwargs):
+    """
+    Invoke an LLM runnable, reusing a cached response for identical messages.
+
+    The LLM runs at temperature 0, so the same messages give the same output.
+    The system prompt and the runnable's output schema are part of the key,
+    so editing a prompt or a structured-output model invalidates its old
+    entries. Cache errors fall back to a plain invoke.
+
+    Args:
+        runnable: LLM or structured-output runnable to invoke.
+        messages: Messages to send.
+        namespace: Cache namespace, e.g. "planner".
+        **kwargs: Passed through to runnable.invoke (e.g. config).
+
+    Returns:
+        The runnable's response.
+    """
+    cache = get_disk_cache(namespace)
+    if cache is None:
+        return runnable.invoke(messages, **kwargs)
+
+    key = _cache_key(runnable, messages)
+    try:
+        hit = cache.get(key)
+    except Exception as e:
+        logger.warning("llm_cache_read_failed", namespace=namespace, error=str(e))
+        hit = None
+    if hit is not None:
+        logger.info("llm_cache_hit", namespace=namespace)
+        return hit
+
+    response = runnable.invoke(messages, **kwargs)
+    try:
+        cache.set(key, response, expire=CACHE_TTL_SECONDS)
+    except Exception as e:
+        logger.warning("llm_cache_write_failed", namespace=namespace, error=str(e))
+    return response
@@ -3,196 +3,297 @@ Executor node for the chat agent.
 Runs tool calls based on the plan from the planner.
 """
 
+import contextvars
+import json
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+
 import structlog
 
 from ..schemas import AgentState
 
-# Import tool logic
-from tools.brain_tools import fetch_brain_context
-from tools.medium_tools import list_medium_articles, get_medium_article_content, search_medium_articles
-from tools.youtube_tools import list_youtube_videos, get_video_transcript, search_video_transcripts
-from tools.github_tools import (
-    list_my_repos, search_repos, get_repo_readme, 
-    get_file_content, search_and_read_repo
-)
-from tools.mail_tool import send_email
+# Tool modules are imported lazily inside each handler: they pull in heavy
+# dependencies (newspaper, PyGithub, Brevo SDK) and most turns use one or two.
+# Per-API rate limits are applied inside the tools (see tools.rate_limit).
 
 logger = structlog.get_logger()
 
+# Upper bound on tool calls run concurrently for one plan
+MAX_PARALLEL_TOOLS = 8
+
+# Cap on full-text payloads (articles, transcripts, READMEs, files) passed on
+# to the synthesizer; prompt length dominates its latency
+MAX_CONTENT_CHARS = 4000
+
+
+# --- RESULT FORMATTING ---
+# Bullet templates for list-style results, filled with each item's dict.
+
+_MEDIUM_LIST_ITEM = "• {title} ({date})\n  {link}"
+_MEDIUM_SEARCH_ITEM = "• {title} (matches: {matches})\n  {link}"
+_YOUTUBE_LIST_ITEM = "• {title}\n  {link}"
+_YOUTUBE_SEARCH_ITEM = "• {title} (matches: {matches})\n  {link}"
+_GITHUB_LIST_ITEM = "• {name} ({language}) ⭐{stars}\n  {description}"
+_GITHUB_SEARCH_ITEM = "• {name} (matches: {matches})\n  {url}"
+
+
+def _clip(text: str) -> str:
+    """Truncate a full-text payload to MAX_CONTENT_CHARS."""
+    if text and len(text) > MAX_CONTENT_CHARS:
+        return text[:MAX_CONTENT_CHARS] + "... [truncated]"
+    return text
+
+
+def _format_list(data: list[dict], item_template: str, header: str, failure: str) -> str:
+    """Format a list-style tool result, or the failure block if it errored."""
+    if data and 'error' not in data[0]:
+        formatted = "\n".join(item_template.format_map(item) for item in data)
+        return f"--- {header} ---\n{formatted}\n"
+    return f"--- {failure} ---\n"
+
+
+# Planner placeholder for email content built from earlier results,
+# e.g. "[Will be filled with bio content]"
+_FILL_PLACEHOLDER = re.compile(r"\[Will be filled[^\]]*\]")
+
+
+# --- TOOL HANDLERS ---
+# Each handler takes the tool call params and the results of earlier calls
+# in the plan, and returns one formatted result block.
+
+def _handle_brain_search(params: dict, prior: list[str]) -> str:
+    from tools.brain_tools import fetch_brain_context
+
+    shortcuts = params.get('shortcuts', [])
+    keywords = params.get('keywords', [])
+    data = fetch_brain_context(shortcut_keys=shortcuts, search_keywords=keywords)
+
+    if data:
+        return "\n".join(
+            f"--- BRAIN: {item.get('source_path', 'unknown')} ---\n{item.get('content', '')}\n"
+            for item in data
+        )
+    return f"--- BRAIN: No results for {params} ---\n"
+
+
+def _handle_medium_list(params: dict, prior: list[str]) -> str:
+    from tools.medium_tools import list_medium_articles
+
+    limit = params.get('limit', 5)
+    data = list_medium_articles(limit=limit)
+    return _format_list(data, _MEDIUM_LIST_ITEM, "MEDIUM: Latest Articles", "MEDIUM: Failed to list articles")
+
+
+def _handle_medium_search(params: dict, prior: list[str]) -> str:
+    from tools.medium_tools import search_medium_articles
+
+    keywords = params.get('keywords', [])
+    data = search_medium_articles(keywords=keywords)
+    return _format_list(data, _MEDIUM_SEARCH_ITEM, "MEDIUM: Search Results", f"MEDIUM: No articles matching {keywords}")
+
+
+def _handle_medium_get_content(params: dict, prior: list[str]) -> str:
+    from tools.medium_tools import get_medium_article_content
+
+    link = params.get('article_link', '')
+    data = get_medium_article_content(article_link=link)
+    if 'error' not in data:
+        return f"--- MEDIUM: {data['title']} ---\n{_clip(data['content'])}\n"
+    return f"--- MEDIUM: {data['error']} ---\n"
+
+
+def _handle_youtube_list(params: dict, prior: list[str]) -> str:
+    from tools.youtube_tools import list_youtube_videos
+
+    limit = params.get('limit', 5)
+    data = list_youtube_videos(limit=limit)
+    return _format_list(data, _YOUTUBE_LIST_ITEM, "YOUTUBE: Latest Videos", "YOUTUBE: Failed to list videos")
+
+
+def _handle_youtube_search(params: dict, prior: list[str]) -> str:
+    from tools.youtube_tools import search_video_transcripts
+
+    keywords = params.get('keywords', [])
+    data = search_video_transcripts(keywords=keywords)
+    return _format_list(data, _YOUTUBE_SEARCH_ITEM, "YOUTUBE: Search Results", f"YOUTUBE: No videos matching {keywords}")
+
+
+def _handle_youtube_get_transcript(params: dict, prior: list[str]) -> str:
+    from tools.youtube_tools import get_video_transcript
+
+    video_id = params.get('video_id', '')
+    data = get_video_transcript(video_id=video_id)
+    if 'error' not in data:
+        return f"--- YOUTUBE TRANSCRIPT: {video_id} ---\n{_clip(data['transcript'])}\n"
+    return f"--- YOUTUBE: {data['error']} ---\n"
+
+
+def _handle_github_list(params: dict, prior: list[str]) -> str:
+    from tools.github_tools import list_my_repos
+
+    limit = params.get('limit', 10)
+    data = list_my_repos(limit=limit)
+    if data and 'error' not in data[0]:
+        data = [{**r, 'description': r['description'] or 'No description'} for r in data]
+    return _format_list(data, _GITHUB_LIST_ITEM, "GITHUB: Repositories", "GITHUB: Failed to list repos")
+
+
+def _handle_github_search(params: dict, prior: list[str]) -> str:
+    from tools.github_tools import search_repos
+
+    keywords = params.get('keywords', [])
+    data = search_repos(keywords=keywords)
+    return _format_list(data, _GITHUB_SEARCH_ITEM, "GITHUB: Search Results", f"GITHUB: No repos matching {keywords}")
+
+
+def _handle_github_get_readme(params: dict, prior: list[str]) -> str:
+    from tools.github_tools import get_repo_readme
+
+    repo_name = params.get('repo_name', '')
+    data = get_repo_readme(repo_name=repo_name)
+    if 'error' not in data:
+        return f"--- GITHUB README: {repo_name} (branch: {data['branch']}) ---\n{_clip(data['content'])}\n"
+    return f"--- GITHUB: {data['error']} ---\n"
+
+
+def _handle_github_get_file(params: dict, prior: list[str]) -> str:
+    from tools.github_tools import get_file_content
+
+    repo_name = params.get('repo_name', '')
+    file_path = params.get('file_path', '')
+    data = get_file_content(repo_name=repo_name, file_path=file_path)
+    if 'error' not in data:
+        return f"--- GITHUB FILE: {repo_name}/{file_path} (branch: {data['branch']}) ---\n{_clip(data['content'])}\n"
+    return f"--- GITHUB: {data['error']} ---\n"
+
+
+def _handle_github_search_and_read(params: dict, prior: list[str]) -> str:
+    from tools.github_tools import search_and_read_repo
+
+    keywords = params.get('keywords', [])
+    data = search_and_read_repo(keywords=keywords)
+    if 'error' not in data:
+        repo_info = data['repo']
+        formatted = f"Found: {repo_info['name']}\nDescription: {repo_info['description']}\nURL: {repo_info['url']}\n\nREADME:\n{_clip(data['readme']) or 'No README'}"
+        return f"--- GITHUB: Search & Read ---\n{formatted}\n"
+    return f"--- GITHUB: {data['error']} ---\n"
+
+
+def _handle_email_send(params: dict, prior: list[str]) -> str:
+    from tools.mail_tool import send_email
+
+    email_to = params.get('email_to', '')
+    subject = params.get('email_subject', 'Message from Virtual Pamudu')
+    content = params.get('email_content', '')
+    cc_email = params.get('email_cc', '') or None
+
+    # If content references previous results, include them. The join is
+    # only built when the content actually needs it.
+    if not content:
+        content = "\n".join(prior) or "No content available."
+    elif '[Will be filled' in content:
+        filled = "\n".join(prior) or "No content available."
+        content = _FILL_PLACEHOLDER.sub(lambda _: filled, content)
+
+    if not email_to:
+        return f"--- EMAIL: Failed to send ---\nError: No 'to_email' specified.\n"
+
+    data = send_email(
+        to_email=email_to,
+        subject=subject,
+        content=content,
+        cc_email=cc_email,
+        is_html=True
+    )
+
+    if data.get('success'):
+        return f"--- EMAIL: Sent successfully ---\nTo: {email_to}\nSubject: {subject}\nMessage ID: {data.get('message_id')}\n"
+    return f"--- EMAIL: Failed to send ---\nError: {data.get('error')}\n"
+
+
+_DISPATCH = {
+    ('brain', 'search'): _handle_brain_search,
+    ('medium', 'list'): _handle_medium_list,
+    ('medium', 'search'): _handle_medium_search,
+    ('medium', 'get_content'): _handle_medium_get_content,
+    ('youtube', 'list'): _handle_youtube_list,
+    ('youtube', 'search'): _handle_youtube_search,
+    ('youtube', 'get_transcript'): _handle_youtube_get_transcript,
+    ('github', 'list'): _handle_github_list,
+    ('github', 'search'): _handle_github_search,
+    ('github', 'get_readme'): _handle_github_get_readme,
+    ('github', 'get_file'): _handle_github_get_file,
+    ('github', 'search_and_read'): _handle_github_search_and_read,
+    ('email', 'send'): _handle_email_send,
+}
+
+
+def _run_tool_call(tc: dict, prior: list[str], log) -> str:
+    """Run a single tool call and return its formatted result block."""
+    tool = tc.get('tool', '')
+    action = tc.get('action', '')
+    params = tc.get('params', {})
+
+    # Per-call detail is debug-only; the guard skips building the event otherwise
+    if log.is_enabled_for(logging.DEBUG):
+        log.debug("executing_tool", tool=tool, action=action, params=params)
+
+    handler = _DISPATCH.get((tool, action))
+    if handler is None:
+        log.error("unknown_tool", tool=tool, action=action)
+        return f"--- ERROR: Unknown tool '{tool}.{action}' ---\n"
+
+    try:
+        return handler(params, prior)
+    except Exception as e:
+        log.error("tool_execution_failed", tool=tool, action=action, error=str(e))
+        return f"--- ERROR: {tool}.{action} failed: {str(e)} ---\n"
+
 
 def executor_node(state: AgentState) -> dict:
     """
     NODE 2: Runs the tool calls based on the plan.
     Executes searches against brain, Medium, YouTube, and GitHub.
+    Independent lookups run concurrently; emails run last, in plan order,
+    so they can include the results of earlier calls.
     """
     log = logger.bind(node="executor")
     log.info("running_tools")
-    
+
     tool_calls = state['plan']
-    results = []
-
-    for tc in tool_calls:
-        tool = tc.get('tool', '')
-        action = tc.get('action', '')
-        params = tc.get('params', {})
-
-        log.info("executing_tool", tool=tool, action=action, params=str(params))
-
-        try:
-            data = None
-            
-            # --- BRAIN TOOL ---
-            if tool == 'brain':
-                shortcuts = params.get('shortcuts', [])
-                keywords = params.get('keywords', [])
-                data = fetch_brain_context(shortcut_keys=shortcuts, search_keywords=keywords)
-                
-                if data:
-                    for item in data:
-                        source = item.get('source_path', 'unknown')
-                        content = item.get('content', '')
-                        results.append(f"--- BRAIN: {source} ---\n{content}\n")
-                else:
-                    results.append(f"--- BRAIN: No results for {params} ---\n")
-
-            # --- MEDIUM TOOL ---
-            elif tool == 'medium':
-                if action == 'list':
-                    limit = params.get('limit', 5)
-                    data = list_medium_articles(limit=limit)
-                    if data and 'error' not in data[0]:
-                        formatted = "\n".join([f"• {a['title']} ({a['date']})\n  {a['link']}" for a in data])
-                        results.append(f"--- MEDIUM: Latest Articles ---\n{formatted}\n")
-                    else:
-                        results.append(f"--- MEDIUM: Failed to list articles ---\n")
-                        
-                elif action == 'search':
-                    keywords = params.get('keywords', [])
-                    data = search_medium_articles(keywords=keywords)
-                    if data and 'error' not in data[0]:
-                        formatted = "\n".join([f"• {a['title']} (matches: {a['matches']})\n  {a['link']}" for a in data])
-                        results.append(f"--- MEDIUM: Search Results ---\n{formatted}\n")
-                    else:
-                        results.append(f"--- MEDIUM: No articles matching {keywords} ---\n")
-                        
-                elif action == 'get_content':
-                    link = params.get('article_link', '')
-                    data = get_medium_article_content(link)
-                    if 'error' not in data:
-                        results.append(f"--- MEDIUM: {data['title']} ---\n{data['content']}\n")
-                    else:
-                        results.append(f"--- MEDIUM: {data['error']} ---\n")
-
-            # --- YOUTUBE TOOL ---
-            elif tool == 'youtube':
-                if action == 'list':
-                    limit = params.get('limit', 5)
-                    data = list_youtube_videos(limit=limit)
-                    if data and 'error' not in data[0]:
-                        formatted = "\n".join([f"• {v['title']}\n  {v['link']}" for v in data])
-                        results.append(f"--- YOUTUBE: Latest Videos ---\n{formatted}\n")
-                    else:
-                        results.append(f"--- YOUTUBE: Failed to list videos ---\n")
-                        
-                elif action == 'search':
-                    keywords = params.get('keywords', [])
-                    data = search_video_transcripts(keywords=keywords)
-                    if data and 'error' not in data[0]:
-                        formatted = "\n".join([f"• {v['title']} (matches: {v['matches']})\n  {v['link']}" for v in data])
-                        results.append(f"--- YOUTUBE: Search Results ---\n{formatted}\n")
-                    else:
-                        results.append(f"--- YOUTUBE: No videos matching {keywords} ---\n")
-                        
-                elif action == 'get_transcript':
-                    video_id = params.get('video_id', '')
-                    data = get_video_transcript(video_id)
-                    if 'error' not in data:
-                        results.append(f"--- YOUTUBE TRANSCRIPT: {video_id} ---\n{data['transcript']}\n")
-                    else:
-                        results.append(f"--- YOUTUBE: {data['error']} ---\n")
-
-            # --- GITHUB TOOL ---
-            elif tool == 'github':
-                if action == 'list':
-                    limit = params.get('limit', 10)
-                    data = list_my_repos(limit=limit)
-                    if data and 'error' not in data[0]:
-                        formatted = "\n".join([f"• {r['name']} ({r['language']}) ⭐{r['stars']}\n  {r['description'] or 'No description'}" for r in data])
-                        results.append(f"--- GITHUB: Repositories ---\n{formatted}\n")
-                    else:
-                        results.append(f"--- GITHUB: Failed to list repos ---\n")
-                        
-                elif action == 'search':
-                    keywords = params.get('keywords', [])
-                    data = search_repos(keywords=keywords)
-                    if data and 'error' not in data[0]:
-                        formatted = "\n".join([f"• {r['name']} (matches: {r['matches']})\n  {r['url']}" for r in data])
-                        results.append(f"--- GITHUB: Search Results ---\n{formatted}\n")
-                    else:
-                        results.append(f"--- GITHUB: No repos matching {keywords} ---\n")
-                        
-                elif action == 'get_readme':
-                    repo_name = params.get('repo_name', '')
-                    data = get_repo_readme(repo_name)
-                    if 'error' not in data:
-                        results.append(f"--- GITHUB README: {repo_name} (branch: {data['branch']}) ---\n{data['content']}\n")
-                    else:
-                        results.append(f"--- GITHUB: {data['error']} ---\n")
-                        
-                elif action == 'get_file':
-                    repo_name = params.get('repo_name', '')
-                    file_path = params.get('file_path', '')
-                    data = get_file_content(repo_name, file_path)
-                    if 'error' not in data:
-                        results.append(f"--- GITHUB FILE: {repo_name}/{file_path} (branch: {data['branch']}) ---\n{data['content']}\n")
-                    else:
-                        results.append(f"--- GITHUB: {data['error']} ---\n")
-                        
-                elif action == 'search_and_read':
-                    keywords = params.get('keywords', [])
-                    data = search_and_read_repo(keywords=keywords)
-                    if 'error' not in data:
-                        repo_info = data['repo']
-                        formatted = f"Found: {repo_info['name']}\nDescription: {repo_info['description']}\nURL: {repo_info['url']}\n\nREADME:\n{data['readme'] or 'No README'}"
-                        results.append(f"--- GITHUB: Search & Read ---\n{formatted}\n")
-                    else:
-                        results.append(f"--- GITHUB: {data['error']} ---\n")
-
-            # --- EMAIL TOOL ---
-            elif tool == 'email':
-                if action == 'send':
-                    email_to = params.get('email_to', '')
-                    subject = params.get('email_subject', 'Message from Virtual Pamudu')
-                    content = params.get('email_content', '')
-                    cc_email = params.get('email_cc', '') or None
-                    
-                    # If content references previous results, include them
-                    if not content or '[Will be filled' in content:
-                        content = "\n".join(results) if results else "No content available."
-                    
-                    if not email_to:
-                        results.append(f"--- EMAIL: Failed to send ---\nError: No 'to_email' specified.\n")
-                    else:
-                        data = send_email(
-                            to_email=email_to,
-                            subject=subject,
-                            content=content,
-                            cc_email=cc_email,
-                            is_html=True
-                        )
-                        
-                        if data.get('success'):
-                            results.append(f"--- EMAIL: Sent successfully ---\nTo: {email_to}\nSubject: {subject}\nMessage ID: {data.get('message_id')}\n")
-                        else:
-                            results.append(f"--- EMAIL: Failed to send ---\nError: {data.get('error')}\n")
-
-            else:
-                log.error("unknown_tool", tool=tool)
-                results.append(f"--- ERROR: Unknown tool '{tool}' ---\n")
-
-        except Exception as e:
-            log.error("tool_execution_failed", tool=tool, action=action, error=str(e))
-            results.append(f"--- ERROR: {tool}.{action} failed: {str(e)} ---\n")
+    # One slot per tool call, filled by index to keep plan order
+    results: list[str | None] = [None] * len(tool_calls)
+
+    # Identical calls in one plan run once; later copies are dropped
+    unique = {}
+    for i, tc in enumerate(tool_calls):
+        key = (tc.get('tool'), tc.get('action'), json.dumps(tc.get('params', {}), sort_keys=True, default=str))
+        unique.setdefault(key, i)
+    if len(unique) < len(tool_calls):
+        log.info("duplicate_tool_calls_skipped", count=len(tool_calls) - len(unique))
+
+    lookups = [i for i in unique.values() if tool_calls[i].get('tool') != 'email']
+    emails = [i for i in unique.values() if tool_calls[i].get('tool') == 'email']
+
+    if len(lookups) > 1:
+        # Tool calls are blocking network I/O, so threads overlap their latency
+        with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_TOOLS, len(lookups))) as pool:
+            # Worker threads don't inherit contextvars, so each call runs in a
+            # copy of this context to keep structlog's bound fields in tool logs
+            futures = {
+                i: pool.submit(contextvars.copy_context().run, _run_tool_call, tool_calls[i], [], log)
+                for i in lookups
+            }
+            for i, future in futures.items():
+                results[i] = future.result()
+    else:
+        for i in lookups:
+            results[i] = _run_tool_call(tool_calls[i], [], log)
+
+    for i in emails:
+        results[i] = _run_tool_call(tool_calls[i], [r for r in results[:i] if r is not None], log)
 
+    results = [r for r in results if r is not None]
     log.info("results_found", count=len(results))
     return {"results": results}
@@ -3,44 +3,54 @@ Planner node for the chat agent.
 Decides IF external data is needed and WHAT tools to use.
 """
 
+import re
+
 import structlog
 from langchain_core.messages import SystemMessage, HumanMessage
+from pydantic import TypeAdapter
 
-from ..schemas import AgentState, AgentPlan
+from ..schemas import AgentState, AgentPlan, ToolCall
 from ..llm import get_llm
+from ..llm_cache import cached_invoke
+from ..history import format_conversation_history
 
 logger = structlog.get_logger()
 
 
 # --- SYSTEM PROMPT ---
 
-PLANNER_SYSTEM_PROMPT = """You are Pamudu's AI Assistant. Help to answer queries about Pamudu to help others know him better.
+_PROMPT_HEADER = """You are Pamudu's AI Assistant. Help to answer queries about Pamudu to help others know him better.
 
 **TONE INSTRUCTION**:
 - Tone should be normal, clear, and human.
 - Not formal. Not overly friendly.
 
-You have access to 5 TOOLS:
+"""
 
-## 1. BRAIN TOOL (Personal Knowledge Base)
+# One section per tool; the router can send a single section on its own
+_TOOL_SECTIONS = {
+    "brain": """## 1. BRAIN TOOL (Personal Knowledge Base)
 - action: "search"
 - params: {"shortcuts": [...], "keywords": [...]}
 - shortcuts: "bio", "resume", "skills", "experience", "education", "projects", "awards"
 - Use for: Who is Pamudu, his background, skills, work history, etc.
 
-## 2. MEDIUM TOOL (Blog Articles)  
+""",
+    "medium": """## 2. MEDIUM TOOL (Blog Articles)  
 - action: "list" → params: {"limit": 5}
 - action: "search" → params: {"keywords": [...]}
 - action: "get_content" → params: {"article_link": "..."}
 - Use for: What has Pamudu written, blog posts, articles, tutorials.
 
-## 3. YOUTUBE TOOL (Videos & Transcripts)
+""",
+    "youtube": """## 3. YOUTUBE TOOL (Videos & Transcripts)
 - action: "list" → params: {"limit": 5}
 - action: "search" → params: {"keywords": [...]}
 - action: "get_transcript" → params: {"video_id": "..."}
 - Use for: What videos has Pamudu made, video content, tutorials.
 
-## 4. GITHUB TOOL (Code & Projects)
+""",
+    "github": """## 4. GITHUB TOOL (Code & Projects)
 - action: "list" → params: {"limit": 10} (list repos)
 - action: "search" → params: {"keywords": [...]} (search repos by keywords)
 - action: "get_readme" → params: {"repo_name": "..."} (get README from main branch)
@@ -48,7 +58,8 @@ You have access to 5 TOOLS:
 - action: "search_and_read" → params: {"keywords": [...]} (search repo and read README)
 - Use for: Pamudu's GitHub projects, code, repositories.
 
-## 5. EMAIL TOOL (Send Emails)
+""",
+    "email": """## 5. EMAIL TOOL (Send Emails)
 - action: "send" → params: {"email_to": "...", "email_subject": "...", "email_content": "...", "email_cc": "..."}
 - Use for: Sending emails. 
 - **CRITICAL PROTOCOL**:
@@ -56,48 +67,56 @@ You have access to 5 TOOLS:
   - **STEP 2**: User provides details (To, Subject, Body). -> Plan: `need_external_info: false` (Synthesizer will draft).
   - **STEP 3**: User says "Yes/Send" to the DRAFT. -> Plan: `tool: email, action: send`.
 
-## RULES:
+""",
+}
 
-1. **RELEVANCE GATE**:
+# Rules and examples, split so a routed prompt only carries the ones for
+# its tool. Rules are numbered when the prompt is assembled.
+_RELEVANCE_RULE = """**RELEVANCE GATE**:
    - If the user query is NOT about Pamudu or his work, do NOT plan any tool calls.
    - **FAST REFUSAL**:
      - Set `need_external_info` to `false`.
      - Set `response` to: "I can only help with questions about Pamudu."
      - This must be done IMMEDIATELY for unrelated topics (e.g., general knowledge, presidents, other countries).
+"""
 
-2. **PRIVACY GUARD**:
+_PRIVACY_RULE = """**PRIVACY GUARD**:
    - Do NOT plan tool usage for sensitive personal data (e.g., phone number, home address).
    - Refuse and offer a safe alternative (e.g., public bio summary).
+"""
 
-3. **EMAIL SAFETY**:
+_EMAIL_SAFETY_RULE = """**EMAIL SAFETY**:
    - **NEVER** plan an email 'send' action in the same turn the user asks to send it.
    - **ALWAYS** check: Has the user explicitly seen the draft and said "Yes"?
    - If "No" or "Not sure" -> do NOT plan 'email' tool.
    - If User just gave details -> do NOT plan 'email' tool (Output draft first).
+"""
 
-4. **UNKNOWN INFO HANDLING**:
+_UNKNOWN_INFO_RULE = """**UNKNOWN INFO HANDLING**:
    - If a question is about Pamudu but you expect the tools will not have it, STILL plan a single best tool search.
    - If nothing is found later, the answer will handle it.
+"""
 
-5. **MULTI TOOL PLANNING**:
+_MULTI_TOOL_RULE = """**MULTI TOOL PLANNING**:
    - Use MULTIPLE tools if the question spans areas (example: bio + articles, or projects + GitHub).
+"""
 
-6. **TOOL SELECTION**:
-   - If query is about Pamudu (personal info, work, skills), use BRAIN tool.
-   - If query is about articles/blog posts, use MEDIUM tool.
-   - If query is about videos/video content, use YOUTUBE tool.
-   - If query is about code/repos/GitHub activity, use GITHUB tool.
-   - If query is to SEND EMAIL (and draft was approved), use EMAIL tool.
+_TOOL_SELECTION = {
+    "brain": "   - If query is about Pamudu (personal info, work, skills), use BRAIN tool.\n",
+    "medium": "   - If query is about articles/blog posts, use MEDIUM tool.\n",
+    "youtube": "   - If query is about videos/video content, use YOUTUBE tool.\n",
+    "github": "   - If query is about code/repos/GitHub activity, use GITHUB tool.\n",
+    "email": "   - If query is to SEND EMAIL (and draft was approved), use EMAIL tool.\n",
+}
 
-7. **GREETINGS & SIMPLE CHAT**:
+_GREETING_RULE = """**GREETINGS & SIMPLE CHAT**:
    - For greetings (Hi, Hello, Hey, etc.) or simple conversational messages, respond IMMEDIATELY.
    - Set `need_external_info` to `false`.
    - Set `response` to a friendly greeting introducing yourself as Pamudu's AI Assistant.
    - Do NOT use any tools for greetings.
+"""
 
-## EXAMPLES:
-
-Query: "Send an email to John"
+_EMAIL_EXAMPLES = """Query: "Send an email to John"
 {
   "need_external_info": false,
   "response": "I can help. What's John's email address and what should the subject and body be?"
@@ -117,7 +136,9 @@ Query: "The draft looks good. Send it." (History shows draft was presented)
   ]
 }
 
-Query: "What is the capital of France?"
+"""
+
+_GENERAL_EXAMPLES = """Query: "What is the capital of France?"
 {
   "need_external_info": false,
   "tool_calls": [],
@@ -133,17 +154,114 @@ Query: "Hi" or "Hello"
 """
 
 
-def _format_conversation_history(history: list[dict]) -> str:
-    """Format conversation history for context."""
-    if not history:
-        return ""
-    
-    formatted = []
-    for msg in history:
-        role = "User" if msg['role'] == 'user' else "Assistant"
-        formatted.append(f"{role}: {msg['content']}")
-    
-    return "\n".join(formatted)
+def _build_prompt(tools: list[str]) -> str:
+    """Assemble the planner prompt with only the given tools' sections, rules and examples."""
+    rules = [_RELEVANCE_RULE, _PRIVACY_RULE]
+    if "email" in tools:
+        rules.append(_EMAIL_SAFETY_RULE)
+    rules.append(_UNKNOWN_INFO_RULE)
+    if len(tools) > 1:
+        rules.append(_MULTI_TOOL_RULE)
+    rules.append("**TOOL SELECTION**:\n" + "".join(_TOOL_SELECTION[tool] for tool in tools))
+    rules.append(_GREETING_RULE)
+
+    if len(tools) > 1:
+        catalog = f"You have access to {len(tools)} TOOLS:\n\n"
+    else:
+        catalog = "You have access to this TOOL:\n\n"
+    examples = (_EMAIL_EXAMPLES if "email" in tools else "") + _GENERAL_EXAMPLES
+
+    return (
+        _PROMPT_HEADER
+        + catalog
+        + "".join(_TOOL_SECTIONS[tool] for tool in tools)
+        + "## RULES:\n\n"
+        + "\n".join(f"{i}. {rule}" for i, rule in enumerate(rules, 1))
+        + "\n## EXAMPLES:\n\n"
+        + examples
+    )
+
+
+PLANNER_SYSTEM_PROMPT = _build_prompt(list(_TOOL_SECTIONS))
+
+# Narrowed prompts used when the router is confident about the tool
+_ROUTED_PROMPTS = {tool: _build_prompt([tool]) for tool in _TOOL_SECTIONS}
+
+# Prompt messages are constant, so build them once and reuse every turn
+_PLANNER_SYS_MSG = SystemMessage(content=PLANNER_SYSTEM_PROMPT)
+_ROUTED_SYS_MSGS = {tool: SystemMessage(content=prompt) for tool, prompt in _ROUTED_PROMPTS.items()}
+
+# History goes in its own message after the system prompt, so the large
+# constant prompt stays an identical prefix for provider prompt caching
+_HISTORY_TEMPLATE = "CONVERSATION HISTORY:\n{hist}"
+
+
+# --- TOOL ROUTER ---
+# Keyword heuristics for queries that clearly target a single tool.
+# Anything ambiguous (no match or several matches) gets the full prompt.
+# Email needs clear send intent: "what is his email?" is a contact question
+# for the brain, not a request to send one.
+# Only the first turn is routed: a follow-up (e.g. email details mid-draft)
+# depends on earlier turns the keywords can't see.
+
+_TOOL_ROUTES = {
+    "brain": re.compile(r"\b(bio|resume|cv|skills?|experience|education|awards?)\b"),
+    "email": re.compile(r"\b(send|write|draft)\b.*\b(e-?mail|mail|message)\b|\be-?mail\s+\S+@"),
+    "github": re.compile(r"\b(github|repos?|repositor(y|ies)|code|readme)\b"),
+    "medium": re.compile(r"\b(medium|articles?|blogs?|posts?)\b"),
+    "youtube": re.compile(r"\b(youtube|videos?|transcripts?|channel)\b"),
+}
+
+
+def _route_tool(query: str) -> str | None:
+    """Return the single tool a query targets, or None if unsure."""
+    lowered = query.lower()
+    matched = [tool for tool, pattern in _TOOL_ROUTES.items() if pattern.search(lowered)]
+    return matched[0] if len(matched) == 1 else None
+
+
+# --- FAST INTENTS ---
+# Greetings and clearly off-topic questions get the canned answers from the
+# prompt EXAMPLES without an LLM round-trip. Both patterns match whole
+# question forms only, so project names like "stock price predictor" or
+# "weather forecasting" still reach the LLM. Anything ambiguous falls through.
+
+_GREETING_RESPONSE = "Hi there! I'm Pamudu's AI Assistant. How can I help you learn about him today?"
+_OFF_TOPIC_RESPONSE = "I can only help with questions about Pamudu."
+
+_GREETING = re.compile(r"^(hi+|hello+|hey+|yo|hola)( there)?[!. ]*$")
+_OFF_TOPIC = re.compile(r"^(who is the president|what('s| is) the weather|what is the capital of)\b")
+# Mentions of Pamudu (directly or by pronoun) keep a query on-topic
+_ABOUT_PAMUDU = re.compile(r"\b(pamudu|he|his|him|you|your)\b")
+
+
+def _fast_intent(query: str) -> str | None:
+    """Return a canned response for greetings and off-topic queries, or None."""
+    lowered = query.lower().strip()
+    if _GREETING.match(lowered):
+        return _GREETING_RESPONSE
+    if _OFF_TOPIC.search(lowered) and not _ABOUT_PAMUDU.search(lowered):
+        return _OFF_TOPIC_RESPONSE
+    return None
+
+
+# Serializes the plan's tool calls to dicts for state storage
+_TOOL_CALLS_ADAPTER = TypeAdapter(list[ToolCall])
+
+
+# Structured-output planner LLM, built on first use and reused across turns
+_PLANNER_LLM = None
+
+
+def _get_planner_llm():
+    """Return the cached structured-output planner LLM."""
+    # Native JSON-schema mode skips the tool-call envelope around the output.
+    # strict is left off: the schemas have optional fields with defaults,
+    # which strict mode rejects.
+    global _PLANNER_LLM
+    if _PLANNER_LLM is None:
+        _PLANNER_LLM = get_llm().with_structured_output(AgentPlan, method="json_schema", include_raw=False)
+    return _PLANNER_LLM
 
 
 def planner_node(state: AgentState) -> dict:
@@ -156,29 +274,41 @@ def planner_node(state: AgentState) -> dict:
     
     user_query = state['query']
     history = state.get('conversation_history', [])
+
+    canned = _fast_intent(user_query)
+    if canned:
+        log.info("fast_intent_matched")
+        return {"plan": [], "final_answer": canned}
     
     # Format conversation history for context
-    history_context = _format_conversation_history(history)
+    history_context = format_conversation_history(history)
+
+    # Narrow the tool catalog when a first-turn query clearly targets one tool
+    routed_tool = None if history else _route_tool(user_query)
+    if routed_tool:
+        log.info("query_routed", tool=routed_tool)
+        system_msg = _ROUTED_SYS_MSGS[routed_tool]
+    else:
+        system_msg = _PLANNER_SYS_MSG
 
     # Build messages with conversation history
-    messages = [SystemMessage(content=PLANNER_SYSTEM_PROMPT)]
+    messages = [system_msg]
     
     if history_context:
-        messages.append(HumanMessage(content=f"CONVERSATION HISTORY:\n{history_context}\n\nCURRENT QUERY: {user_query}"))
-    else:
-        messages.append(HumanMessage(content=user_query))
+        messages.append(SystemMessage(content=_HISTORY_TEMPLATE.format(hist=history_context)))
+    messages.append(HumanMessage(content=user_query))
 
     # Use 'with_structured_output' to get JSON back reliably
-    llm = get_llm()
-    planner_llm = llm.with_structured_output(AgentPlan)
-    plan = planner_llm.invoke(messages)
+    plan = cached_invoke(_get_planner_llm(), messages, "planner")
 
-    log.info("plan_generated", need_info=plan.need_external_info, tool_calls=len(plan.tool_calls))
-    for tc in plan.tool_calls:
-        log.info("tool_plan", tool=tc.tool, action=tc.action, params=str(tc.params))
+    log.info(
+        "plan_generated",
+        need_info=plan.need_external_info,
+        tool_calls=[f"{tc.tool}.{tc.action}" for tc in plan.tool_calls],
+    )
 
     # Convert to dicts for state storage
-    calls_as_dicts = [tc.model_dump() for tc in plan.tool_calls] if plan.need_external_info else []
+    calls_as_dicts = _TOOL_CALLS_ADAPTER.dump_python(plan.tool_calls) if plan.need_external_info else []
 
     return {
         "plan": calls_as_dicts,
@@ -3,11 +3,16 @@ Synthesizer node for the chat agent.
 Generates the final answer with structured citations.
 """
 
+import logging
+
 import structlog
 from langchain_core.messages import SystemMessage, HumanMessage
+from pydantic import TypeAdapter
 
-from ..schemas import AgentState, AgentResponse
+from ..schemas import AgentState, AgentResponse, Citation
 from ..llm import get_llm
+from ..llm_cache import cached_invoke
+from ..history import format_conversation_history
 
 logger = structlog.get_logger()
 
@@ -73,18 +78,28 @@ SUGGESTED QUESTIONS:
 - Questions should be relevant to the current topic and Pamudu.
 - Examples: "What projects has he built?", "Tell me about his skills", "Any recent blog posts?"'''
 
+_SYNTH_SYS_MSG = SystemMessage(content=SYNTHESIZER_SYSTEM_PROMPT)
 
-def _format_conversation_history(history: list[dict]) -> str:
-    """Format conversation history for context."""
-    if not history:
-        return ""
-    
-    formatted = []
-    for msg in history:
-        role = "User" if msg['role'] == 'user' else "Assistant"
-        formatted.append(f"{role}: {msg['content']}")
-    
-    return "\n".join(formatted)
+# Tag on the plain-text answer call, so token streaming can tell its chunks
+# apart from the structured (JSON) calls in the graph
+ANSWER_STREAM_TAG = "answer_stream"
+
+
+# Serializes response citations to dicts for state storage
+_CITATIONS_ADAPTER = TypeAdapter(list[Citation])
+
+
+# Structured-output synthesizer LLM, built on first use and reused across turns
+_SYNTH_LLM = None
+
+
+def _get_synth_llm():
+    """Return the cached structured-output synthesizer LLM."""
+    # Native JSON-schema mode skips the tool-call envelope around the output
+    global _SYNTH_LLM
+    if _SYNTH_LLM is None:
+        _SYNTH_LLM = get_llm().with_structured_output(AgentResponse, method="json_schema", include_raw=False)
+    return _SYNTH_LLM
 
 
 def synthesizer_node(state: AgentState) -> dict:
@@ -112,7 +127,7 @@ def synthesizer_node(state: AgentState) -> dict:
         context_block = "No new search results available."
 
     # Include history for follow-up context
-    history_context = _format_conversation_history(history) if not has_new_results else ""
+    history_context = format_conversation_history(history) if not has_new_results else ""
 
     # Build the full context
     full_context = f"User Query: {query}\n\n"
@@ -121,16 +136,14 @@ def synthesizer_node(state: AgentState) -> dict:
     full_context += f"--- RETRIEVED CONTEXT ---\n{context_block}"
 
     messages = [
-        SystemMessage(content=SYNTHESIZER_SYSTEM_PROMPT),
+        _SYNTH_SYS_MSG,
         HumanMessage(content=full_context)
     ]
 
-    llm = get_llm()
-    
     # Fast path for simple responses (no new context = greeting/follow-up)
     if not has_new_results:
         # Use regular LLM call for faster response (no need for structured output)
-        response = llm.invoke(messages)
+        response = cached_invoke(get_llm(), messages, "synthesizer_text", config={"tags": [ANSWER_STREAM_TAG]})
         log.info("generated_simple_response")
         return {
             "final_answer": response.content,
@@ -139,15 +152,15 @@ def synthesizer_node(state: AgentState) -> dict:
         }
     
     # Full structured output for responses with citations
-    structured_llm = llm.with_structured_output(AgentResponse)
-    response = structured_llm.invoke(messages)
+    response = cached_invoke(_get_synth_llm(), messages, "synthesizer")
     
     # Convert citations to dicts for state storage
-    citations_as_dicts = [c.model_dump() for c in response.citations]
+    citations_as_dicts = _CITATIONS_ADAPTER.dump_python(response.citations)
     
     log.info("generated_structured_response", citations=len(citations_as_dicts))
-    for c in response.citations:
-        log.info("citation", source_type=c.source_type, source_name=c.source_name)
+    if log.is_enabled_for(logging.DEBUG):
+        for c in response.citations:
+            log.debug("citation", source_type=c.source_type, source_name=c.source_name)
     
     return {
         "final_answer": response.answer,
@@ -2,8 +2,7 @@
 Pydantic models and TypedDict definitions for the chat agent.
 """
 
-import operator
-from typing import Annotated, TypedDict, Literal, Optional, Union
+from typing import Annotated, TypedDict, Literal, Optional, Required, Union
 
 from pydantic import BaseModel, Field
 
@@ -16,15 +15,22 @@ ShortcutKey = Literal[SHORTCUT_KEYS]  # type: ignore
 
 # --- STATE DEFINITION ---
 
-class AgentState(TypedDict):
-    """Shared memory state for the agent graph."""
-    query: str
+def _extend_results(left: list[str], right: list[str]) -> list[str]:
+    """Reducer for 'results': extend in place instead of copying with '+'."""
+    left.extend(right)
+    return left
+
+
+class AgentState(TypedDict, total=False):
+    """Shared memory state for the agent graph. Only 'query' is required; nodes
+    read the other keys with defaults."""
+    query: Required[str]
     # Conversation history for multi-turn coherence
-    conversation_history: list[dict]  # [{"role": "user/assistant", "content": "..."}]
+    conversation_history: list[dict]  # [{"role": "user/assistant/system", "content": "..."}]
     # 'plan' is a list of search arguments (shortcuts/keywords)
     plan: list[dict]
     # 'results' is a list of strings found from the tools
-    results: Annotated[list[str], operator.add]
+    results: Annotated[list[str], _extend_results]
     # Structured final response with citations
     final_answer: str
     citations: list[dict]
@@ -2,22 +2,141 @@
 ChatSession class for managing stateful conversations.
 """
 
+import uuid
+from collections import deque
+
 import structlog
 
 from .graph import app
+from .history import summarize_turns
+from .nodes.synthesizer import ANSWER_STREAM_TAG
 
 logger = structlog.get_logger()
 
+# Turns kept verbatim; older turns are compacted into a one-line summary
+HISTORY_WINDOW_TURNS = 6
+
+# Display names for tools in status messages
+_TOOL_LABELS = {
+    "github": "GitHub",
+    "medium": "Medium",
+    "youtube": "YouTube",
+    "brain": "Brain",
+    "email": "Email",
+}
+
+
+# --- STREAM EVENT HANDLERS ---
+# One per graph node: each turns the node's state update into stream events
+# and records the answer in the per-turn `turn` dict.
+
+_EMPTY_UPDATE: dict = {}
+
+
+def _on_planner(update: dict, turn: dict):
+    # Capture final_answer if planner provides it directly
+    planner_answer = update.get("final_answer")
+    if planner_answer:
+        turn["final_answer"] = planner_answer
+
+    plan = update.get("plan")
+    if plan:
+        # Create a nice message like "Using tools: GitHub, Medium..."
+        details = [_TOOL_LABELS[t['tool']] for t in plan if t.get('tool') in _TOOL_LABELS]
+        # Dedupe in plan order (a set would shuffle the display order)
+        msg = f"🔎 Using tools: {', '.join(dict.fromkeys(details))}..."
+        yield {"type": "status", "node": "planner", "message": msg}
+    else:
+        yield {"type": "status", "node": "planner", "message": "📝 Thinking..."}
+
+
+def _on_executor(update: dict, turn: dict):
+    msg = f"📊 Analyzed {len(update.get('results', ()))} search results."
+    yield {"type": "status", "node": "executor", "message": msg}
+    yield {"type": "status", "node": "synthesizer", "message": "✍️ Drafting response..."}
+
+
+def _on_synthesizer(update: dict, turn: dict):
+    # Use synthesizer answer if available, otherwise the captured planner answer
+    synth_answer = update.get("final_answer")
+    if synth_answer:
+        turn["final_answer"] = synth_answer
+
+    # Final Result
+    yield {
+        "type": "result",
+        "answer": turn["final_answer"],
+        "citations": update.get("citations", []),
+        "suggested_questions": update.get("suggested_questions", []),
+        "history_length": turn["history_length"]
+    }
+    turn["result_sent"] = True
+
+
+_NODE_HANDLERS = {
+    "planner": _on_planner,
+    "executor": _on_executor,
+    "synthesizer": _on_synthesizer,
+}
+
 
 class ChatSession:
     """
     A stateful chat session that maintains conversation history.
+
+    Only the last HISTORY_WINDOW_TURNS turns are kept verbatim. Older turns
+    are compacted into a summary of their questions, so per-turn work and
+    prompt size stay bounded however long the conversation runs.
     """
     
-    def __init__(self):
-        """Initialize a new chat session."""
-        self.conversation_history: list[dict] = []
+    def __init__(self, session_id: str | None = None):
+        """
+        Initialize a new chat session.
+        
+        Args:
+            session_id: Identifier bound to this session's log lines.
+                Auto-generated if not provided.
+        """
+        self._recent: deque[dict] = deque(maxlen=HISTORY_WINDOW_TURNS * 2)
+        self._earlier_turns = 0
+        self._earlier_questions: deque[str] = deque(maxlen=HISTORY_WINDOW_TURNS)
+        self._session_id = session_id or uuid.uuid4().hex
+        # One bound logger per session rather than one per message
+        self._log = logger.bind(session_id=self._session_id)
     
+    @property
+    def conversation_history(self) -> list[dict]:
+        """Recent messages, preceded by a "system" summary of older turns."""
+        history = list(self._recent)
+        if self._earlier_turns:
+            summary = summarize_turns(self._earlier_turns, list(self._earlier_questions))
+            history.insert(0, {"role": "system", "content": summary})
+        return history
+
+    @conversation_history.setter
+    def conversation_history(self, history: list[dict]):
+        """Replace the history (e.g. loaded from storage), compacting as needed."""
+        self._recent.clear()
+        self._earlier_turns = 0
+        self._earlier_questions.clear()
+        for msg in history:
+            if msg['role'] != 'system':
+                self._add_message(msg['role'], msg['content'])
+
+    def _add_message(self, role: str, content: str):
+        """Append a message, moving the oldest one into the summary when full."""
+        if len(self._recent) == self._recent.maxlen:
+            oldest = self._recent.popleft()
+            if oldest['role'] == 'user':
+                self._earlier_turns += 1
+                self._earlier_questions.append(oldest['content'])
+        self._recent.append({"role": role, "content": content})
+
+    @property
+    def turn_count(self) -> int:
+        """Number of completed turns, including compacted ones."""
+        return self._earlier_turns + len(self._recent) // 2
+
     def chat(self, user_message: str) -> dict:
         """
         Send a message and get a response.
@@ -28,128 +147,109 @@ class ChatSession:
         Returns:
             Dict with 'answer', 'citations', and 'history_length'.
         """
-        log = logger.bind(user_message_length=len(user_message))
-        log.info("processing_new_message")
+        # Bound via contextvars so graph node logs for this turn carry it too
+        with structlog.contextvars.bound_contextvars(user_message_length=len(user_message)):
+            self._log.info("processing_new_message")
         
-        # Run the agent with conversation history
-        inputs = {
-            "query": user_message,
-            "conversation_history": self.conversation_history.copy(),
-            "results": [],
-            "citations": [],
-            "suggested_questions": []
-        }
-        result = app.invoke(inputs)
+            # Run the agent with conversation history
+            inputs = {
+                "query": user_message,
+                "conversation_history": self.conversation_history,
+                "results": [],
+                "citations": [],
+                "suggested_questions": []
+            }
+            result = app.invoke(inputs)
         
-        answer = result.get('final_answer', 'No response generated.')
-        citations = result.get('citations', [])
-        suggested_questions = result.get('suggested_questions', [])
+            answer = result.get('final_answer', 'No response generated.')
+            citations = result.get('citations', [])
+            suggested_questions = result.get('suggested_questions', [])
         
-        # Update conversation history (no limit)
-        self.conversation_history.append({"role": "user", "content": user_message})
-        self.conversation_history.append({"role": "assistant", "content": answer})
+            # Update conversation history
+            self._add_message("user", user_message)
+            self._add_message("assistant", answer)
         
-        log.info("message_complete", history_length=len(self.conversation_history) // 2)
+            self._log.info("message_complete", history_length=self.turn_count)
         
         return {
             "answer": answer,
             "citations": citations,
             "suggested_questions": suggested_questions,
-            "history_length": len(self.conversation_history) // 2  # Number of turns
+            "history_length": self.turn_count  # Number of turns
         }
     
-    def chat_stream(self, user_message: str):
+    def chat_stream(self, user_message: str, stream_tokens: bool = False):
         """
         Stream the agent's execution steps and final response.
         Yields generator of status updates and final result.
+
+        Args:
+            user_message: The user's message.
+            stream_tokens: Also yield {"type": "token"} events with answer
+                text as the LLM generates it. Only plain-text answers stream;
+                structured answers with citations arrive whole in the result.
         """
-        log = logger.bind(user_message_length=len(user_message))
-        log.info("processing_new_message_stream")
+        # Not bound via contextvars here: a generator would leak the binding
+        # into the consumer's context between yields
+        self._log.info("processing_new_message_stream", user_message_length=len(user_message))
         
         inputs = {
             "query": user_message,
-            "conversation_history": self.conversation_history.copy(),
+            "conversation_history": self.conversation_history,
             "results": [],
             "citations": [],
             "suggested_questions": []
         }
         
-        final_answer = ""
+        # Per-turn stream state shared with the node handlers
+        turn = {"final_answer": "", "result_sent": False, "history_length": self.turn_count + 1}
         
         # 1. Yield Initial Status
         yield {"type": "status", "node": "start", "message": "🧠 Analyzing request..."}
         
         # 2. Iterate through Graph Steps
-        for output in app.stream(inputs):
+        stream_mode = ["updates", "messages"] if stream_tokens else "updates"
+        for event in app.stream(inputs, stream_mode=stream_mode):
+            if stream_tokens:
+                mode, output = event
+                if mode == "messages":
+                    chunk, metadata = output
+                    if chunk.content and ANSWER_STREAM_TAG in metadata.get("tags", []):
+                        yield {"type": "token", "content": chunk.content}
+                    continue
+            else:
+                output = event
+
             for node_name, state_update in output.items():
-                # Guard against None state_update
-                if state_update is None:
-                    state_update = {}
-                
-                if node_name == "planner":
-                    plan = state_update.get("plan", [])
-                    # Capture final_answer if planner provides it directly
-                    planner_answer = state_update.get("final_answer", "")
-                    if planner_answer:
-                        final_answer = planner_answer
-                    
-                    if plan:
-                        tool_names = [t.get('tool') for t in plan]
-                        actions = [t.get('action') for t in plan]
-                        # Create a nice message like "Searching GitHub, Reading Medium..."
-                        details = []
-                        for t, a in zip(tool_names, actions):
-                            if t == 'github': details.append("GitHub")
-                            elif t == 'medium': details.append("Medium")
-                            elif t == 'youtube': details.append("YouTube")
-                            elif t == 'brain': details.append("Brain")
-                            elif t == 'email': details.append("Email")
-                        
-                        unique_tools = list(set(details))
-                        msg = f"🔎 Using tools: {', '.join(unique_tools)}..."
-                        yield {"type": "status", "node": "planner", "message": msg}
-                    else:
-                        yield {"type": "status", "node": "planner", "message": "📝 Thinking..."}
-                        
-                elif node_name == "executor":
-                    results = state_update.get("results", [])
-                    msg = f"📊 Analyzed {len(results)} search results."
-                    yield {"type": "status", "node": "executor", "message": msg}
-                    yield {"type": "status", "node": "synthesizer", "message": "✍️ Drafting response..."}
-                    
-                elif node_name == "synthesizer":
-                    # Synthesizer may return empty dict if using planner response
-                    synth_answer = state_update.get("final_answer", "")
-                    citations = state_update.get("citations", [])
-                    suggested_questions = state_update.get("suggested_questions", [])
-                    
-                    # Use synthesizer answer if available, otherwise use captured planner answer
-                    if synth_answer:
-                        final_answer = synth_answer
-                    
-                    # Final Result
-                    yield {
-                        "type": "result",
-                        "answer": final_answer,
-                        "citations": citations,
-                        "suggested_questions": suggested_questions,
-                        "history_length": len(self.conversation_history) // 2 + 1
-                    }
+                handler = _NODE_HANDLERS.get(node_name)
+                if handler:
+                    # Synthesizer may send None when using the planner response
+                    yield from handler(state_update or _EMPTY_UPDATE, turn)
+        
+        # Planner answered directly (greeting/refusal), so the synthesizer never ran
+        if not turn["result_sent"]:
+            yield {
+                "type": "result",
+                "answer": turn["final_answer"],
+                "citations": [],
+                "suggested_questions": [],
+                "history_length": turn["history_length"]
+            }
                     
         # 3. Update History
-        self.conversation_history.append({"role": "user", "content": user_message})
-        self.conversation_history.append({"role": "assistant", "content": final_answer})
+        self._add_message("user", user_message)
+        self._add_message("assistant", turn["final_answer"])
         
-        log.info("message_stream_complete")
+        self._log.info("message_stream_complete", user_message_length=len(user_message))
 
     def clear_history(self):
         """Clear the conversation history."""
         self.conversation_history = []
-        logger.info("history_cleared")
+        self._log.info("history_cleared")
     
     def get_history(self) -> list[dict]:
-        """Get the current conversation history."""
-        return self.conversation_history.copy()
+        """Get the current conversation history (a new list)."""
+        return self.conversation_history
 
 
 # Initial suggestions for the UI before any conversation
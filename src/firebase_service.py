@@ -5,12 +5,13 @@ Handles session and message storage for the Virtual Pamudu chat.
 
 import os
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 from dotenv import load_dotenv
 
 import firebase_admin
 from firebase_admin import credentials, firestore
+from google.api_core.exceptions import NotFound
 
 load_dotenv()
 
@@ -25,15 +26,12 @@ class FirebaseService:
        (base64 encode if needed for your deployment platform)
     """
     
-    _instance = None
     _db = None
     
-    def __new__(cls):
-        """Singleton pattern to ensure single Firebase initialization."""
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialize()
-        return cls._instance
+    def __init__(self):
+        """Initialize Firebase; use get_firebase_service() for the shared instance."""
+        if self._db is None:
+            self._initialize()
     
     def _initialize(self):
         """Initialize Firebase Admin SDK."""
@@ -92,9 +90,10 @@ class FirebaseService:
         """
         sessions_ref = self.db.collection("sessions")
         
+        now = datetime.now(timezone.utc)
         session_data = {
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow(),
+            "created_at": now,
+            "updated_at": now,
             "messages": []
         }
         
@@ -158,23 +157,7 @@ class FirebaseService:
         Returns:
             True if successful, False if session not found.
         """
-        doc_ref = self.db.collection("sessions").document(session_id)
-        doc = doc_ref.get()
-        
-        if not doc.exists:
-            return False
-        
-        message = {
-            "role": role,
-            "content": content,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        doc_ref.update({
-            "messages": firestore.ArrayUnion([message]),
-            "updated_at": datetime.utcnow()
-        })
-        return True
+        return self.add_messages_bulk(session_id, [(role, content)])
     
     def add_turn(self, session_id: str, user_message: str, assistant_message: str) -> bool:
         """
@@ -183,22 +166,41 @@ class FirebaseService:
         Returns:
             True if successful.
         """
-        doc_ref = self.db.collection("sessions").document(session_id)
-        doc = doc_ref.get()
+        return self.add_messages_bulk(
+            session_id,
+            [("user", user_message), ("assistant", assistant_message)]
+        )
+    
+    def add_messages_bulk(self, session_id: str, messages: list[tuple[str, str]]) -> bool:
+        """
+        Add several messages to a session in a single write.
         
-        if not doc.exists:
-            return False
+        Args:
+            session_id: The session ID.
+            messages: (role, content) pairs, in order.
+            
+        Returns:
+            True if successful, False if session not found.
+        """
+        doc_ref = self.db.collection("sessions").document(session_id)
         
-        now = datetime.utcnow().isoformat()
-        messages = [
-            {"role": "user", "content": user_message, "timestamp": now},
-            {"role": "assistant", "content": assistant_message, "timestamp": now}
+        # One timestamp for the whole write
+        now = datetime.now(timezone.utc)
+        now_iso = now.isoformat()
+        entries = [
+            {"role": role, "content": content, "timestamp": now_iso}
+            for role, content in messages
         ]
         
-        doc_ref.update({
-            "messages": firestore.ArrayUnion(messages),
-            "updated_at": datetime.utcnow()
-        })
+        # update() fails with NotFound for a missing session, so no
+        # existence check (and extra round trip) is needed first
+        try:
+            doc_ref.update({
+                "messages": firestore.ArrayUnion(entries),
+                "updated_at": now
+            })
+        except NotFound:
+            return False
         return True
     
     def clear_messages(self, session_id: str) -> bool:
@@ -209,16 +211,23 @@ class FirebaseService:
             True if successful, False if session not found.
         """
         doc_ref = self.db.collection("sessions").document(session_id)
-        if doc_ref.get().exists:
+        try:
             doc_ref.update({
                 "messages": [],
-                "updated_at": datetime.utcnow()
+                "updated_at": datetime.now(timezone.utc)
             })
-            return True
-        return False
+        except NotFound:
+            return False
+        return True
+
+
+# Singleton instance, created on first use (only once initialization succeeds)
+_INSTANCE: Optional[FirebaseService] = None
 
 
-# Singleton instance
 def get_firebase_service() -> FirebaseService:
     """Get the Firebase service singleton."""
-    return FirebaseService()
+    global _INSTANCE
+    if _INSTANCE is None:
+        _INSTANCE = FirebaseService()
+    return _INSTANCE
@@ -1,20 +1,42 @@
 import os
 import yaml
-import re
+import string
+import threading
 from collections import Counter
 
 # --- CONFIGURATION ---
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 BRAIN_ROOT = os.path.join(BASE_DIR, "digital_brain")
 
+# libyaml's C loader when PyYAML was built with it; same results as SafeLoader
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Token counts per brain file, keyed by relative path: {rel_path: (mtime, Counter)}
+_FILE_INDEX: dict[str, tuple[float, Counter]] = {}
+# Inverted index over _FILE_INDEX: {token: {rel_path: count}}
+_POSTINGS: dict[str, dict[str, int]] = {}
+# Guards both indexes; brain searches can run on concurrent executor threads
+_INDEX_LOCK = threading.Lock()
+
+# Parsed shortcuts.yaml with its mtime: (mtime, {key: rel_path})
+_SHORTCUTS_CACHE: tuple[float, dict] | None = None
+
 # --- HELPERS ---
 def _load_shortcuts():
+    """Parsed shortcuts.yaml, re-parsed only when the file's mtime changes."""
+    global _SHORTCUTS_CACHE
     path = os.path.join(BRAIN_ROOT, "shortcuts.yaml")
-    if not os.path.exists(path): return {}
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError: return {}
+    if _SHORTCUTS_CACHE and _SHORTCUTS_CACHE[0] == mtime:
+        return _SHORTCUTS_CACHE[1]
     try:
         with open(path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f) or {}
+            shortcuts = yaml.load(f, Loader=_YAML_LOADER) or {}
     except: return {}
+    _SHORTCUTS_CACHE = (mtime, shortcuts)
+    return shortcuts
 
 def _read_file_safe(rel_path):
     full_path = os.path.normpath(os.path.join(BRAIN_ROOT, rel_path))
@@ -25,11 +47,69 @@ def _read_file_safe(rel_path):
             return f.read()
     except: return None
 
+# bytes.translate table: keeps a-z, 0-9 and whitespace, blanks every other byte
+_KEEP = (string.ascii_lowercase + string.digits + string.whitespace).encode()
+_TOKEN_TABLE = bytes(c if c in _KEEP else 32 for c in range(256))
+
 def _preprocess_text(text):
     if not text: return []
-    text = text.lower()
-    text = re.sub(r'[^a-z0-9\s]', ' ', text)
-    return text.split()
+    # Non-ASCII characters become '?' and then blanks, just as the old
+    # [^a-z0-9\s] regex blanked them (unicode spaces split tokens either way)
+    return text.lower().encode('ascii', 'replace').translate(_TOKEN_TABLE).decode('ascii').split()
+
+def _drop_file(rel_path):
+    """Remove a file from the token and postings indexes."""
+    cached = _FILE_INDEX.pop(rel_path, None)
+    if not cached: return
+    for token in cached[1]:
+        paths = _POSTINGS.get(token)
+        if paths is not None:
+            paths.pop(rel_path, None)
+            if not paths: del _POSTINGS[token]
+
+def _index_file(rel_path, entry):
+    """(Re)index a brain file, reading it only when its mtime changes."""
+    try:
+        mtime = entry.stat().st_mtime
+    except OSError:
+        _drop_file(rel_path)
+        return
+    cached = _FILE_INDEX.get(rel_path)
+    if cached and cached[0] == mtime:
+        return
+
+    _drop_file(rel_path)
+    try:
+        with open(entry.path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except: return
+    if not content: return
+    counts = Counter(_preprocess_text(content))
+    _FILE_INDEX[rel_path] = (mtime, counts)
+    for token, count in counts.items():
+        _POSTINGS.setdefault(token, {})[rel_path] = count
+
+def _iter_md(path, prefix=""):
+    """Yield (rel_path, DirEntry) for markdown files under path, recursively."""
+    try:
+        entries = list(os.scandir(path))
+    except OSError:
+        return
+    for entry in entries:
+        rel_path = prefix + entry.name
+        if entry.is_dir(follow_symlinks=False):
+            yield from _iter_md(entry.path, rel_path + os.sep)
+        elif entry.name.endswith(".md"):
+            yield rel_path, entry
+
+def _refresh_index():
+    """Bring the indexes in line with the markdown files on disk."""
+    seen = set()
+    for rel_path, entry in _iter_md(BRAIN_ROOT):
+        seen.add(rel_path)
+        _index_file(rel_path, entry)
+    for rel_path in _FILE_INDEX.keys() - seen:
+        _drop_file(rel_path)
 
 # --- THE ENGINE ---
 
@@ -64,30 +144,19 @@ def fetch_brain_context(shortcut_keys: list, search_keywords: list, top_n: int =
         clean_query_tokens = _preprocess_text(raw_query)
         
         if clean_query_tokens:
-            for root, _, files in os.walk(BRAIN_ROOT):
-                for file in files:
-                    if file.endswith(".md") and file != "shortcuts.yaml":
-                        full_path = os.path.join(root, file)
-                        rel_path = os.path.relpath(full_path, BRAIN_ROOT)
-                        
-                        content = _read_file_safe(rel_path)
-                        if not content: continue
-                        
-                        # Score File
-                        file_tokens = _preprocess_text(content)
-                        file_token_counts = Counter(file_tokens)
-                        
-                        score = 0
-                        for token in clean_query_tokens:
-                            score += file_token_counts[token]
-                        
-                        # --- THE THRESHOLD CHECK ---
-                        # Only keep if score meets the minimum requirement
-                        if score >= threshold:
-                            file_scores[rel_path] = score
-
-            # Sort best matches first
-            sorted_files = sorted(file_scores.items(), key=lambda item: item[1], reverse=True)
+            # Score only the files that contain a query token, via the postings
+            with _INDEX_LOCK:
+                _refresh_index()
+                for token in clean_query_tokens:
+                    for rel_path, count in _POSTINGS.get(token, {}).items():
+                        file_scores[rel_path] = file_scores.get(rel_path, 0) + count
+
+            # --- THE THRESHOLD CHECK ---
+            # Only keep if score meets the minimum requirement
+            file_scores = {path: score for path, score in file_scores.items() if score >= threshold}
+
+            # Sort best matches first (ties by path, for a stable order)
+            sorted_files = sorted(file_scores.items(), key=lambda item: (-item[1], item[0]))
             
             for rel_path, score in sorted_files[:top_n]:
                 content = _read_file_safe(rel_path)
@@ -0,0 +1,110 @@
+"""
+Result caching for tool functions, in memory and on disk.
+"""
+
+import functools
+import inspect
+import threading
+import time
+
+from utils import get_disk_cache
+
+
+def _is_error(result) -> bool:
+    """Tool error shapes: {"error": ...} or [{"error": ...}]."""
+    if isinstance(result, dict):
+        return "error" in result
+    if isinstance(result, list) and result and isinstance(result[0], dict):
+        return "error" in result[0]
+    return False
+
+
+def _make_key(signature: inspect.Signature, args: tuple, kwargs: dict) -> str:
+    """
+    Cache key from the bound arguments, defaults included, so f("a") and
+    f(video_id="a") share an entry. Arguments may be unhashable (keyword
+    lists), so the key is their repr.
+    """
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return repr(tuple(bound.arguments.items()))
+
+
+def ttl_cache(seconds: float, maxsize: int = 128):
+    """
+    Memoize a tool function's results for `seconds`.
+
+    Calls are keyed by their bound arguments (see _make_key). Error results are not cached, so a failed call is retried next time.
+    The wrapped function gets a `cache_clear()` method.
+
+    Args:
+        seconds: How long a result stays fresh.
+        maxsize: Maximum number of cached results (oldest evicted first).
+    """
+    def decorator(func):
+        cache: dict[str, tuple[float, object]] = {}
+        lock = threading.Lock()
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _make_key(signature, args, kwargs)
+            now = time.monotonic()
+            with lock:
+                hit = cache.get(key)
+            if hit and hit[0] > now:
+                return hit[1]
+
+            result = func(*args, **kwargs)
+            if not _is_error(result):
+                with lock:
+                    cache[key] = (now + seconds, result)
+                    while len(cache) > maxsize:
+                        del cache[next(iter(cache))]
+            return result
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+
+def disk_cache(namespace: str, expire: float):
+    """
+    Persist a tool function's results on disk for `expire` seconds.
+
+    For results that are slow to build and rarely change (parsed articles,
+    transcripts), so they survive restarts. Keyed like ttl_cache; error
+    results are not cached. Disk cache failures fall back to a plain call.
+
+    Args:
+        namespace: Cache namespace (see utils.get_disk_cache).
+        expire: Seconds until a cached result is dropped.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = get_disk_cache(namespace)
+            if cache is None:
+                return func(*args, **kwargs)
+
+            key = _make_key(signature, args, kwargs)
+            try:
+                hit = cache.get(key)
+            except Exception:
+                hit = None
+            if hit is not None:
+                return hit
+
+            result = func(*args, **kwargs)
+            if not _is_error(result):
+                try:
+                    cache.set(key, result, expire=expire)
+                except Exception:
+                    pass
+            return result
+
+        return wrapper
+    return decorator
+
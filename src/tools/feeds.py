@@ -0,0 +1,120 @@
+"""
+RSS/Atom feed fetching shared by the Medium and YouTube tools.
+
+Feeds are fetched with conditional GETs and parsed with lxml, extracting
+only the fields the tools use.
+"""
+
+import contextlib
+import threading
+import time
+import urllib.error
+import urllib.request
+from io import BytesIO
+
+from lxml import etree
+
+from tools.rate_limit import limited
+
+# Minimum time between revalidations of the same feed
+FEED_TTL = 60
+
+# Seconds to wait for a feed response
+FEED_TIMEOUT = 15
+
+_CONTENT_NS = "{http://purl.org/rss/1.0/modules/content/}"
+_MEDIA_NS = "{http://search.yahoo.com/mrss/}"
+_YT_NS = "{http://www.youtube.com/xml/schemas/2015}"
+
+# Parsed feeds by URL: (fresh_until, entries, etag, last_modified)
+_FEEDS: dict[str, tuple[float, list[dict], str | None, str | None]] = {}
+_FEEDS_LOCK = threading.Lock()
+
+
+def _parse_entries(body: bytes) -> list[dict]:
+    """
+    Extract entries from an RSS <item> or Atom <entry> feed.
+
+    Each entry has title, link, published, summary and video_id
+    (YouTube only, else None); missing fields are empty strings.
+    """
+    entries = []
+    # Feeds are untrusted: no entity expansion, external fetches or huge trees
+    parser = etree.iterparse(
+        BytesIO(body), tag=("{*}item", "{*}entry"),
+        resolve_entities=False, no_network=True, huge_tree=False
+    )
+    for _, el in parser:
+        link_el = el.find("{*}link")
+        link = ""
+        if link_el is not None:
+            link = link_el.get("href") or (link_el.text or "").strip()
+
+        # RSS <description>, else Medium's full <content:encoded>, else
+        # YouTube's <media:description>
+        summary = (
+            el.findtext("{*}description")
+            or el.findtext(f"{_CONTENT_NS}encoded")
+            or el.findtext(f".//{_MEDIA_NS}description")
+            or ""
+        )
+
+        entries.append({
+            "title": (el.findtext("{*}title") or "").strip(),
+            "link": link,
+            "published": el.findtext("{*}pubDate") or el.findtext("{*}published") or "",
+            "summary": summary,
+            "video_id": el.findtext(f"{_YT_NS}videoId"),
+        })
+        el.clear()
+    return entries
+
+
+def fetch_feed(url: str, ttl: float = FEED_TTL, api: str | None = None) -> list[dict]:
+    """
+    Fetch a feed's entries, reusing the last parse while it is unchanged.
+
+    Within `ttl` seconds the cached entries are returned without a request.
+    After that the feed is revalidated with a conditional GET (ETag /
+    Last-Modified); a 304 keeps the cached entries. Failed fetches raise
+    and are not cached.
+
+    Args:
+        url: Feed URL.
+        ttl: Seconds a parse is served without revalidating.
+        api: Rate limiter the request runs under (see tools.rate_limit);
+            cached and fresh entries take no permit.
+
+    Returns:
+        List of entry dicts (see _parse_entries).
+    """
+    now = time.monotonic()
+    with _FEEDS_LOCK:
+        hit = _FEEDS.get(url)
+    if hit and hit[0] > now:
+        return hit[1]
+
+    request = urllib.request.Request(url, headers={"User-Agent": "virtual-pamudu/1.0"})
+    if hit:
+        _, _, etag, modified = hit
+        if etag:
+            request.add_header("If-None-Match", etag)
+        if modified:
+            request.add_header("If-Modified-Since", modified)
+
+    try:
+        with limited(api) if api else contextlib.nullcontext():
+            with urllib.request.urlopen(request, timeout=FEED_TIMEOUT) as response:
+                body = response.read()
+                etag = response.headers.get("ETag")
+                modified = response.headers.get("Last-Modified")
+    except urllib.error.HTTPError as e:
+        if e.code != 304 or not hit:
+            raise
+        entries, etag, modified = hit[1], hit[2], hit[3]
+    else:
+        entries = _parse_entries(body)
+
+    with _FEEDS_LOCK:
+        _FEEDS[url] = (now + ttl, entries, etag, modified)
+    return entries
@@ -4,29 +4,105 @@ Simplified for virtual assistant: search repos and read content from main branch
 """
 
 import os
-from github import Github
+import time
+import heapq
+import functools
+import urllib.parse
+from datetime import datetime
+from typing import TYPE_CHECKING
 from dotenv import load_dotenv
 
+from tools.cache import ttl_cache
+from tools.rate_limit import rate_limited
+
+if TYPE_CHECKING:
+    from github import Github
+
 load_dotenv()
 
 # --- CONFIGURATION ---
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")  # Read once; see _reset_for_tests
 USER = "pamudu123"
 
+# How long results stay cached: repo listings change often, file content rarely
+REPO_LIST_TTL = 180
+CONTENT_TTL = 1800
+
+# Pooled connections kept by the shared client; matches the most GitHub
+# requests allowed in flight at once (see tools.rate_limit)
+POOL_SIZE = 10
+
+# Below this many requests left in the hourly budget, calls fail fast until
+# the reset instead of running into 403s. Retry-After and secondary rate
+# limits are already handled by PyGithub's default retry policy.
+RATE_LIMIT_FLOOR = 10
+
 # Initialize GitHub client (lazy)
 _github_client = None
 
 
-def _get_github() -> Github:
-    """Lazy initialization of GitHub client."""
+def _get_github() -> "Github":
+    """Lazy initialization of GitHub client; raises if the rate limit is nearly spent."""
     global _github_client
     if _github_client is None:
         if not GITHUB_TOKEN:
             raise ValueError("GITHUB_TOKEN not found in environment")
-        _github_client = Github(GITHUB_TOKEN)
+        # PyGithub is imported on first use to keep it off the import path
+        from github import Github
+        _github_client = Github(GITHUB_TOKEN, per_page=100, pool_size=POOL_SIZE)
+
+    remaining = rate_limit_remaining()
+    if remaining is not None and remaining < RATE_LIMIT_FLOOR:
+        reset = _github_client.requester.rate_limiting_resettime
+        if reset > time.time():
+            raise RuntimeError(
+                f"GitHub rate limit nearly exhausted ({remaining} requests left), "
+                f"resets at {datetime.fromtimestamp(reset):%H:%M}"
+            )
     return _github_client
 
 
+def rate_limit_remaining() -> int | None:
+    """
+    Requests left in the token's rate limit budget.
+
+    Read from the headers of the last response, so no extra API call is
+    made; None before the first request.
+    """
+    if _github_client is None:
+        return None
+    remaining, limit = _github_client.requester.rate_limiting
+    return remaining if limit >= 0 else None
+
+
+@functools.lru_cache(maxsize=1)
+def _user():
+    """The configured user; USER is constant, so fetch it only once."""
+    return _get_github().get_user(USER)
+
+
+@functools.lru_cache(maxsize=128)
+def _repo(repo_name: str):
+    """Repository handle, shared so its default branch is loaded only once."""
+    return _user().get_repo(repo_name)
+
+
+# The user's most recently updated public repos with everything list_my_repos
+# returns, in one GraphQL round trip (REST pages them and the user separately)
+_REPOS_QUERY = """
+query($login: String!, $n: Int!) {
+  user(login: $login) {
+    repositories(first: $n, privacy: PUBLIC, ownerAffiliations: [OWNER],
+                 orderBy: {field: UPDATED_AT, direction: DESC}) {
+      nodes { name description primaryLanguage { name } stargazerCount updatedAt url }
+    }
+  }
+}
+"""
+
+
+@ttl_cache(REPO_LIST_TTL)
+@rate_limited("github")
 def list_my_repos(limit: int = 10) -> list[dict]:
     """
     List repositories owned by the user.
@@ -39,18 +115,21 @@ def list_my_repos(limit: int = 10) -> list[dict]:
     """
     try:
         g = _get_github()
-        user = g.get_user(USER)
-        repos = user.get_repos(sort='updated')
+        _, data = g.requester.graphql_query(_REPOS_QUERY, {"login": USER, "n": min(limit, 100)})
+        nodes = data["data"]["user"]["repositories"]["nodes"]
         
         result = []
-        for repo in repos[:limit]:
+        for repo in nodes:
+            language = repo.get("primaryLanguage") or {}
+            # Same "YYYY-MM-DD HH:MM:SS+00:00" format PyGithub's datetimes gave
+            updated = datetime.fromisoformat(repo["updatedAt"].replace("Z", "+00:00"))
             result.append({
-                "name": repo.name,
-                "description": repo.description,
-                "language": repo.language,
-                "stars": repo.stargazers_count,
-                "updated": str(repo.updated_at),
-                "url": repo.html_url
+                "name": repo["name"],
+                "description": repo["description"],
+                "language": language.get("name"),
+                "stars": repo["stargazerCount"],
+                "updated": str(updated),
+                "url": repo["url"]
             })
         
         return result
@@ -96,17 +175,52 @@ def search_repos(keywords: list[str], limit: int = 5) -> list[dict]:
                     "matches": matches
                 })
         
-        results.sort(key=lambda x: len(x['matches']), reverse=True)
-        return results[:limit]
+        # Top `limit` by number of matches (ties keep listing order)
+        return heapq.nlargest(limit, results, key=lambda x: len(x['matches']))
         
     except Exception as e:
         return [{"error": f"Search failed: {str(e)}"}]
 
 
+# README names tried in one GraphQL round trip, in order of preference
+_README_NAMES = ("README.md", "readme.md", "README.rst", "README.txt", "README")
+
+_README_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    url
+    defaultBranchRef { name }
+    %s
+  }
+}
+""" % "\n    ".join(
+    f'f{i}: object(expression: "HEAD:{name}") {{ ... on Blob {{ text }} }}'
+    for i, name in enumerate(_README_NAMES)
+)
+
+
+def _readme_via_rest(repo_name: str) -> dict:
+    """README lookup through REST, which finds any README file name."""
+    repo = _repo(repo_name)
+    readme = repo.get_readme()
+    return {
+        "repo": repo_name,
+        "branch": repo.default_branch,
+        "filename": readme.name,
+        "content": readme.decoded_content.decode('utf-8'),
+        "url": readme.html_url
+    }
+
+
+@ttl_cache(CONTENT_TTL)
+@rate_limited("github")
 def get_repo_readme(repo_name: str) -> dict:
     """
     Get the README content of a repository from the main branch.
     
+    The repo and its README come back in a single GraphQL query; REST
+    (two more round trips) is only used for unusual README file names.
+    
     Args:
         repo_name: Name of the repository.
         
@@ -114,22 +228,33 @@ def get_repo_readme(repo_name: str) -> dict:
         Dict with README content and metadata.
     """
     try:
-        g = _get_github()
-        repo = g.get_user(USER).get_repo(repo_name)
-        readme = repo.get_readme()
+        _, data = _get_github().requester.graphql_query(
+            _README_QUERY, {"owner": USER, "name": repo_name}
+        )
+        repo = data["data"]["repository"]
+        if repo is None:
+            return {"error": f"Failed to get README: repository {repo_name} not found"}
         
-        return {
-            "repo": repo_name,
-            "branch": repo.default_branch,
-            "filename": readme.name,
-            "content": readme.decoded_content.decode('utf-8'),
-            "url": readme.html_url
-        }
+        branch = (repo.get("defaultBranchRef") or {}).get("name")
+        for i, name in enumerate(_README_NAMES):
+            blob = repo.get(f"f{i}")
+            if blob and blob.get("text") is not None:
+                return {
+                    "repo": repo_name,
+                    "branch": branch,
+                    "filename": name,
+                    "content": blob["text"],
+                    "url": f"{repo['url']}/blob/{branch}/{name}"
+                }
+        
+        return _readme_via_rest(repo_name)
         
     except Exception as e:
         return {"error": f"Failed to get README: {str(e)}"}
 
 
+@ttl_cache(CONTENT_TTL)
+@rate_limited("github")
 def get_file_content(repo_name: str, file_path: str) -> dict:
     """
     Get the content of a specific file from the main branch of a repository.
@@ -142,20 +267,34 @@ def get_file_content(repo_name: str, file_path: str) -> dict:
         Dict with file content and metadata.
     """
     try:
-        g = _get_github()
-        repo = g.get_user(USER).get_repo(repo_name)
+        repo = _repo(repo_name)
         
-        # Get file from the default (main) branch
-        file_content = repo.get_contents(file_path, ref=repo.default_branch)
+        # The raw media type returns the file verbatim from the default (main)
+        # branch: no base64 payload to decode, and no 1 MB contents limit.
+        # The path is quoted like PyGithub's get_contents does.
+        quoted_path = urllib.parse.quote(file_path)
+        status, headers, body = _get_github().requester.requestJson(
+            "GET",
+            f"/repos/{USER}/{repo_name}/contents/{quoted_path}",
+            parameters={"ref": repo.default_branch},
+            headers={"Accept": "application/vnd.github.raw"},
+            follow_302_redirect=True,
+        )
+        if status >= 300:
+            return {"error": f"Failed to get file content: HTTP {status} {body[:200]}"}
+        # Directories (and anything else without a raw form) come back as a
+        # JSON listing instead of the file itself
+        if headers.get("content-type", "").startswith("application/json"):
+            return {"error": f"Failed to get file content: {file_path} is not a file"}
         
         return {
             "repo": repo_name,
             "branch": repo.default_branch,
             "file_path": file_path,
-            "filename": file_content.name,
-            "content": file_content.decoded_content.decode('utf-8'),
-            "size": file_content.size,
-            "url": file_content.html_url
+            "filename": os.path.basename(file_path),
+            "content": body,
+            "size": len(body.encode('utf-8')),
+            "url": f"{repo.html_url}/blob/{repo.default_branch}/{quoted_path}"
         }
         
     except Exception as e:
@@ -210,6 +349,15 @@ def search_and_read_repo(keywords: list[str]) -> dict:
         return {"error": f"Search and read failed: {str(e)}"}
 
 
+def _reset_for_tests() -> None:
+    """Re-read GITHUB_TOKEN and drop the client and all cached handles and results."""
+    global GITHUB_TOKEN, _github_client
+    GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+    _github_client = None
+    for cached in (_user, _repo, list_my_repos, get_repo_readme, get_file_content):
+        cached.cache_clear()
+
+
 # --- TESTING ---
 if __name__ == "__main__":
     print("🐙 Testing GitHub Tools...")
@@ -4,8 +4,6 @@ Email Tools - Send emails using Brevo (Sendinblue) API.
 
 import os
 from dotenv import load_dotenv
-import sib_api_v3_sdk
-from sib_api_v3_sdk.rest import ApiException
 
 load_dotenv()
 
@@ -15,6 +13,21 @@ DEFAULT_RECIPIENT = "pamuduranasinghe9@gmail.com"
 DEFAULT_SENDER_EMAIL = "pamudu123456789@gmail.com"  # Must be verified in Brevo
 DEFAULT_SENDER_NAME = "Virtual Pamudu"
 
+# Wrapper for send_simple_email messages; {body} is the message HTML
+_HTML_TEMPLATE = """
+    <html>
+    <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+        <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+            {body}
+            <hr style="margin-top: 30px; border: none; border-top: 1px solid #eee;">
+            <p style="color: #888; font-size: 12px;">
+                Sent by Virtual Pamudu AI Assistant
+            </p>
+        </div>
+    </body>
+    </html>
+    """
+
 
 def send_email(
     subject: str,
@@ -44,6 +57,9 @@ def send_email(
     Returns:
         Dict with status and message_id or error.
     """
+    # The Brevo SDK is large and only needed when an email is sent
+    import sib_api_v3_sdk
+    from sib_api_v3_sdk.rest import ApiException
     
     try:
         # Configure API key
@@ -94,26 +110,16 @@ def send_simple_email(subject: str, message: str, cc_email: str | None = None) -
     
     Args:
         subject: Email subject.
-        message: Email message (plain text, will be wrapped in HTML).
+        message: Email message (plain text, will be wrapped in HTML; a message
+            starting with '<' is taken as HTML).
         cc_email: Optional CC email address.
         
     Returns:
         Dict with status.
     """
-    # Wrap plain text in simple HTML
-    html_content = f"""
-    <html>
-    <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-        <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-            {message.replace(chr(10), '<br>')}
-            <hr style="margin-top: 30px; border: none; border-top: 1px solid #eee;">
-            <p style="color: #888; font-size: 12px;">
-                Sent by Virtual Pamudu AI Assistant
-            </p>
-        </div>
-    </body>
-    </html>
-    """
+    # Plain text needs its line breaks converted; HTML is used as-is
+    body = message if message.lstrip().startswith("<") else message.replace("\n", "<br>")
+    html_content = _HTML_TEMPLATE.format(body=body)
     
     return send_email(
         subject=subject,
@@ -2,20 +2,37 @@
 Medium Tools - Fetch articles and content from Medium RSS feed.
 """
 
-import feedparser
 import json
+import heapq
+import functools
 import warnings
-from curl_cffi import requests
 
-# Suppress SyntaxWarning from newspaper3k (invalid escape sequences in Python 3.12+)
-with warnings.catch_warnings():
-    warnings.filterwarnings("ignore", category=SyntaxWarning)
-    from newspaper import Article
+from tools.cache import disk_cache
+from tools.feeds import fetch_feed
+from tools.rate_limit import rate_limited
 
 # --- CONFIGURATION ---
 USERNAME = "pamudu1111"
 RSS_URL = f"https://medium.com/feed/@{USERNAME}"
 
+# Parsed articles are kept on disk for a day; published posts rarely change
+ARTICLE_TTL = 24 * 3600
+
+
+@functools.lru_cache(maxsize=1)
+def _article_class():
+    """
+    Import newspaper's Article on first use.
+
+    newspaper3k pulls in nltk, PIL and friends, so it is kept off the
+    import path until an article is actually read.
+    """
+    # Suppress SyntaxWarning from newspaper3k (invalid escape sequences in Python 3.12+)
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=SyntaxWarning)
+        from newspaper import Article
+    return Article
+
 
 def list_medium_articles(limit: int = 5) -> list[dict]:
     """
@@ -28,20 +45,20 @@ def list_medium_articles(limit: int = 5) -> list[dict]:
         List of article metadata dicts with title, date, link, and preview.
     """
     try:
-        feed = feedparser.parse(RSS_URL)
+        entries = fetch_feed(RSS_URL, api="medium")
         
-        if not feed.entries:
+        if not entries:
             return []
         
         articles = []
-        for entry in feed.entries[:limit]:
+        for entry in entries[:limit]:
             # Get a preview from summary (strip HTML)
-            preview = entry.get('summary', '')[:200] if entry.get('summary') else ''
+            preview = entry['summary'][:200]
             
             articles.append({
-                "title": entry.title,
-                "date": entry.published,
-                "link": entry.link,
+                "title": entry['title'],
+                "date": entry['published'],
+                "link": entry['link'],
                 "preview": preview
             })
         
@@ -51,6 +68,8 @@ def list_medium_articles(limit: int = 5) -> list[dict]:
         return [{"error": f"Failed to fetch articles: {str(e)}"}]
 
 
+@disk_cache("medium", expire=ARTICLE_TTL)
+@rate_limited("medium")
 def get_medium_article_content(article_link: str) -> dict:
     """
     Fetches the full content of a specific Medium article.
@@ -61,6 +80,8 @@ def get_medium_article_content(article_link: str) -> dict:
     Returns:
         Dict with title, content, and metadata.
     """
+    from curl_cffi import requests
+    
     try:
         # Use curl_cffi to bypass TLS fingerprint checks
         response = requests.get(article_link, impersonate="chrome")
@@ -69,7 +90,7 @@ def get_medium_article_content(article_link: str) -> dict:
             return {"error": f"Failed to fetch article. Status: {response.status_code}"}
         
         # Parse with newspaper
-        article = Article(article_link)
+        article = _article_class()(article_link)
         article.download_state = 2  # Skip download, we have HTML
         article.set_html(response.text)
         article.parse()
@@ -98,17 +119,17 @@ def search_medium_articles(keywords: list[str], limit: int = 5) -> list[dict]:
         List of matching articles with relevance info.
     """
     try:
-        feed = feedparser.parse(RSS_URL)
+        entries = fetch_feed(RSS_URL, api="medium")
         
-        if not feed.entries:
+        if not entries:
             return []
         
         results = []
         keywords_lower = [k.lower() for k in keywords]
         
-        for entry in feed.entries:
-            title_lower = entry.title.lower()
-            summary_lower = entry.get('summary', '').lower()
+        for entry in entries:
+            title_lower = entry['title'].lower()
+            summary_lower = entry['summary'].lower()
             
             # Check for keyword matches
             matches = []
@@ -120,17 +141,15 @@ def search_medium_articles(keywords: list[str], limit: int = 5) -> list[dict]:
             
             if matches:
                 results.append({
-                    "title": entry.title,
-                    "date": entry.published,
-                    "link": entry.link,
+                    "title": entry['title'],
+                    "date": entry['published'],
+                    "link": entry['link'],
                     "matches": matches,
-                    "preview": entry.get('summary', '')[:200]
+                    "preview": entry['summary'][:200]
                 })
         
-        # Sort by number of matches
-        results.sort(key=lambda x: len(x['matches']), reverse=True)
-        
-        return results[:limit]
+        # Top `limit` by number of matches (ties keep feed order)
+        return heapq.nlargest(limit, results, key=lambda x: len(x['matches']))
         
     except Exception as e:
         return [{"error": f"Search failed: {str(e)}"}]
@@ -0,0 +1,128 @@
+"""
+Adaptive per-API concurrency limits for tool calls.
+
+Each external API gets a limiter that caps in-flight requests. On a clean
+request the cap grows additively; on a rate-limit response it is halved
+(AIMD), so bursts of parallel tool calls back off before retries pile up.
+
+Limits are applied where the request is made (rate_limited / limited),
+below the result caches, so cache hits neither wait for a permit nor
+count as requests, and fan-out inside a tool takes one permit per request.
+"""
+
+import contextlib
+import functools
+import re
+import threading
+
+import structlog
+
+logger = structlog.get_logger()
+
+# Error text that signals the API throttled us (HTTP 429, GitHub's 403 rate limit)
+_THROTTLED = re.compile(r"\b429\b|rate limit", re.IGNORECASE)
+
+
+def is_throttled(error: str) -> bool:
+    """Whether a tool error or exception message says the API throttled us."""
+    return bool(_THROTTLED.search(error))
+
+
+class AdaptiveLimiter:
+    """Concurrency cap for one API, adjusted AIMD-style from call outcomes."""
+
+    def __init__(self, name: str, initial: int, maximum: int, minimum: int = 1):
+        self.name = name
+        self._limit = float(initial)
+        self._min = minimum
+        self._max = maximum
+        self._active = 0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def __enter__(self):
+        with self._cond:
+            while self._active >= int(self._limit):
+                self._cond.wait()
+            self._active += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify()
+
+    def record(self, throttled: bool) -> None:
+        """Adjust the cap after a call: halve it if throttled, else grow it."""
+        with self._cond:
+            if throttled:
+                self._limit = max(self._min, self._limit / 2)
+                logger.warning("rate_limited", api=self.name, limit=int(self._limit))
+            elif self._limit < self._max:
+                # Additive increase: roughly +1 per `limit` clean calls
+                self._limit = min(self._max, self._limit + 1 / self._limit)
+                self._cond.notify_all()
+
+
+# One limiter per external API; brain (local files) and email are not limited
+TOOL_LIMITERS = {
+    "github": AdaptiveLimiter("github", initial=5, maximum=10),
+    "medium": AdaptiveLimiter("medium", initial=10, maximum=20),
+    "youtube": AdaptiveLimiter("youtube", initial=10, maximum=20),
+}
+
+
+def _result_error(result) -> str | None:
+    """Error text of a tool result: {"error": ...} or [{"error": ...}]."""
+    if isinstance(result, list) and result:
+        result = result[0]
+    if isinstance(result, dict) and result.get("error"):
+        return str(result["error"])
+    return None
+
+
+@contextlib.contextmanager
+def limited(api: str):
+    """
+    Hold a permit of `api`'s limiter around one request and record the
+    outcome. An exception counts as throttled if its message says so.
+    """
+    limiter = TOOL_LIMITERS[api]
+    with limiter:
+        try:
+            yield
+        except Exception as e:
+            limiter.record(is_throttled(str(e)))
+            raise
+    limiter.record(False)
+
+
+def rate_limited(api: str):
+    """
+    Run each call of a tool function under `api`'s limiter.
+
+    Tools catch their own exceptions and return {"error": ...} (or a list
+    holding one), so throttling is read from that error text only; the
+    content of successful results is never scanned. Goes below any cache
+    decorator, and only on functions that make the requests themselves.
+    """
+    limiter = TOOL_LIMITERS[api]
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with limiter:
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as e:
+                    limiter.record(is_throttled(str(e)))
+                    raise
+            error = _result_error(result)
+            limiter.record(is_throttled(error) if error else False)
+            return result
+
+        return wrapper
+    return decorator
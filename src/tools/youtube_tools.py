@@ -2,14 +2,19 @@
 YouTube Tools - Fetch videos and transcripts from YouTube channel.
 """
 
-import feedparser
-from youtube_transcript_api import YouTubeTranscriptApi
-from youtube_transcript_api.formatters import TextFormatter
+from concurrent.futures import ThreadPoolExecutor
+
+from tools.cache import disk_cache
+from tools.feeds import fetch_feed
+from tools.rate_limit import rate_limited
 
 # --- CONFIGURATION ---
 CHANNEL_ID = "UCvLnrajdjeV3w-WuBiBmX7w"  # @pamudu123ranasinghe7
 RSS_URL = f"https://www.youtube.com/feeds/videos.xml?channel_id={CHANNEL_ID}"
 
+# A video's captions don't change, so transcripts are kept on disk for a month
+TRANSCRIPT_TTL = 30 * 24 * 3600
+
 
 def list_youtube_videos(limit: int = 5) -> list[dict]:
     """
@@ -22,19 +27,19 @@ def list_youtube_videos(limit: int = 5) -> list[dict]:
         List of video metadata with title, video_id, link, and description.
     """
     try:
-        feed = feedparser.parse(RSS_URL)
+        entries = fetch_feed(RSS_URL, api="youtube")
         
-        if not feed.entries:
+        if not entries:
             return []
         
         videos = []
-        for entry in feed.entries[:limit]:
+        for entry in entries[:limit]:
             videos.append({
-                "title": entry.title,
-                "video_id": entry.yt_videoid,
-                "link": entry.link,
-                "published": entry.published,
-                "description": entry.get('summary', '')[:300]
+                "title": entry['title'],
+                "video_id": entry['video_id'],
+                "link": entry['link'],
+                "published": entry['published'],
+                "description": entry['summary'][:300]
             })
         
         return videos
@@ -43,6 +48,8 @@ def list_youtube_videos(limit: int = 5) -> list[dict]:
         return [{"error": f"Failed to fetch videos: {str(e)}"}]
 
 
+@disk_cache("yt-transcripts", expire=TRANSCRIPT_TTL)
+@rate_limited("youtube")
 def get_video_transcript(video_id: str) -> dict:
     """
     Fetches the transcript/captions of a YouTube video.
@@ -53,6 +60,10 @@ def get_video_transcript(video_id: str) -> dict:
     Returns:
         Dict with video_id, transcript text, and metadata.
     """
+    # Imported on first use; most turns never fetch a transcript
+    from youtube_transcript_api import YouTubeTranscriptApi
+    from youtube_transcript_api.formatters import TextFormatter
+    
     try:
         api = YouTubeTranscriptApi()
         transcript = api.fetch(video_id)
@@ -113,16 +124,16 @@ def search_video_transcripts(keywords: list[str], limit: int = 3) -> list[dict]:
         List of videos with matching transcript snippets.
     """
     try:
-        videos = list_youtube_videos(limit=limit)
+        videos = [v for v in list_youtube_videos(limit=limit) if 'error' not in v]
         results = []
         keywords_lower = [k.lower() for k in keywords]
         
-        for video in videos:
-            if 'error' in video:
-                continue
-                
-            transcript_data = get_video_transcript(video['video_id'])
-            
+        # Transcript fetches are independent HTTP round trips, so overlap them;
+        # each fetch takes its own YouTube permit, so the limiter still caps them
+        with ThreadPoolExecutor(max_workers=max(1, len(videos))) as pool:
+            transcripts = list(pool.map(get_video_transcript, [v['video_id'] for v in videos]))
+        
+        for video, transcript_data in zip(videos, transcripts):
             if 'error' in transcript_data:
                 continue
             
@@ -133,10 +144,11 @@ def search_video_transcripts(keywords: list[str], limit: int = 3) -> list[dict]:
             snippets = []
             
             for kw in keywords_lower:
-                if kw in transcript_lower:
+                # One find() both tests for the keyword and locates the snippet
+                idx = transcript_lower.find(kw)
+                if idx != -1:
                     matches.append(kw)
                     # Extract snippet around the keyword
-                    idx = transcript_lower.find(kw)
                     start = max(0, idx - 100)
                     end = min(len(transcript_data['transcript']), idx + 100)
                     snippet = transcript_data['transcript'][start:end]
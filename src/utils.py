@@ -6,10 +6,41 @@ import os
 import sys
 import yaml
 import logging
+import functools
 import structlog
+from diskcache import Cache
+
+# libyaml's C loader when PyYAML was built with it; same results as SafeLoader
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+logger = structlog.get_logger()
+
+# Set once setup_logging has configured structlog
+_LOGGING_CONFIGURED = False
+
+_SHORTCUTS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    "digital_brain",
+    "shortcuts.yaml"
+)
 
 def setup_logging():
-    """Configure structlog for the application."""
+    """
+    Configure structlog for the application.
+
+    The level comes from the LOG_LEVEL environment variable (default INFO);
+    set LOG_LEVEL=DEBUG to see per-tool-call detail. Calls after the first
+    are no-ops.
+    """
+    global _LOGGING_CONFIGURED
+    if _LOGGING_CONFIGURED:
+        return
+    _LOGGING_CONFIGURED = True
+
+    level = logging.getLevelName(os.getenv("LOG_LEVEL", "INFO").upper())
+    if not isinstance(level, int):
+        level = logging.INFO
+
     structlog.configure(
         processors=[
             structlog.contextvars.merge_contextvars,
@@ -19,29 +50,52 @@ def setup_logging():
             structlog.processors.TimeStamper(fmt="iso"),
             structlog.dev.ConsoleRenderer() 
         ],
-        wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         context_class=dict,
         logger_factory=structlog.PrintLoggerFactory(),
         cache_logger_on_first_use=True
     )
 
+@functools.lru_cache(maxsize=None)
+def get_disk_cache(namespace: str) -> Cache | None:
+    """
+    Get the on-disk cache for a namespace.
+
+    Caches live under DISK_CACHE_DIR (default ~/.cache/virtual-pamudu).
+    Set DISK_CACHE=0 to turn caching off.
+
+    Args:
+        namespace: Subdirectory name, e.g. "planner".
+
+    Returns:
+        diskcache.Cache instance, or None if caching is off or the cache
+        directory can't be used (callers then skip caching).
+    """
+    if os.getenv("DISK_CACHE", "1") == "0":
+        return None
+    root = os.getenv("DISK_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "virtual-pamudu")
+    try:
+        return Cache(os.path.join(root, namespace))
+    except Exception as e:
+        logger.warning("disk_cache_unavailable", namespace=namespace, error=str(e))
+        return None
+
+@functools.lru_cache(maxsize=1)
 def load_shortcut_keys() -> tuple[str, ...]:
     """
     Load valid shortcut keys from the shortcuts.yaml file.
     
+    The file is read once per process; call load_shortcut_keys.cache_clear()
+    to pick up edits.
+    
     Returns:
         Tuple of shortcut key strings from digital_brain/shortcuts.yaml
     """
-    logger = structlog.get_logger()
-    shortcuts_path = os.path.join(
-        os.path.dirname(os.path.dirname(__file__)), 
-        "digital_brain", 
-        "shortcuts.yaml"
-    )
     try:
-        with open(shortcuts_path, "r", encoding="utf-8") as f:
-            shortcuts = yaml.safe_load(f)
+        with open(_SHORTCUTS_PATH, "r", encoding="utf-8") as f:
+            shortcuts = yaml.load(f, Loader=_YAML_LOADER)
             return tuple(shortcuts.keys()) if shortcuts else ()
     except Exception as e:
-        logger.warning("failed_to_load_shortuts", error=str(e))
+        if logger.is_enabled_for(logging.WARNING):
+            logger.warning("failed_to_load_shortcuts", error=str(e))
         return ("bio", "profile", "contact", "resume", "experience", "education", "skills", "awards", "projects")
@@ -1,8 +1,29 @@
 import sys
 import os
-from pathlib import Path
+from unittest.mock import patch
 
-# Add the project root to sys.path so we can import src
+import pytest
+
+# Put src first on sys.path so its modules are found before anything else
 # This assumes conftest.py is in /tests/ and src is in /src/
-root_dir = Path(__file__).parent.parent
-sys.path.append(str(root_dir / "src"))
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+sys.path.insert(0, SRC_DIR)
+
+# Tests mock the LLM per case, so cached responses must never leak between them
+os.environ["DISK_CACHE"] = "0"
+
+
+@pytest.fixture
+def patched_github(monkeypatch):
+    """Mocked PyGithub client class, with a fake token and fresh github_tools state."""
+    from tools import github_tools
+
+    monkeypatch.setenv("GITHUB_TOKEN", "fake_token")
+    with patch('github.Github') as mock:
+        # No response headers seen yet
+        mock.return_value.requester.rate_limiting = (-1, -1)
+        github_tools._reset_for_tests()
+        yield mock
+    # Don't leave the mocked client or its cached results behind
+    monkeypatch.undo()
+    github_tools._reset_for_tests()
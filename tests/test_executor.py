@@ -0,0 +1,67 @@
+import threading
+import pytest
+from unittest.mock import patch
+from chat import executor_node, AgentState
+
+@pytest.fixture
+def handlers():
+    """Fake brain/github/email handlers that record their calls, in call order."""
+    calls = []
+
+    def make(name):
+        def handler(params, prior):
+            calls.append((name, params, list(prior)))
+            return f"--- {name.upper()}: {params} ---\n"
+        return handler
+
+    fakes = {
+        ('brain', 'search'): make("brain"),
+        ('github', 'list'): make("github"),
+        ('email', 'send'): make("email"),
+    }
+    with patch.dict('chat.nodes.executor._DISPATCH', fakes):
+        yield calls
+
+def test_executor_runs_lookups_concurrently(handlers):
+    """Test Case 1: Independent lookups overlap instead of running one by one"""
+    # Each call waits for the other, so this only passes if both run at once
+    barrier = threading.Barrier(2, timeout=5)
+
+    def waiting(params, prior):
+        barrier.wait()
+        return f"--- WAIT: {params} ---\n"
+
+    with patch.dict('chat.nodes.executor._DISPATCH', {('brain', 'search'): waiting, ('github', 'list'): waiting}):
+        result = executor_node(AgentState(query="q", plan=[
+            {"tool": "brain", "action": "search", "params": {"shortcuts": ["bio"]}},
+            {"tool": "github", "action": "list", "params": {"limit": 5}},
+        ]))
+
+    # Results keep plan order
+    assert result["results"] == [
+        "--- WAIT: {'shortcuts': ['bio']} ---\n",
+        "--- WAIT: {'limit': 5} ---\n",
+    ]
+
+def test_executor_runs_email_last_with_earlier_results(handlers):
+    """Test Case 2: Emails run after the lookups and see the results planned before them"""
+    result = executor_node(AgentState(query="q", plan=[
+        {"tool": "brain", "action": "search", "params": {"shortcuts": ["bio"]}},
+        {"tool": "email", "action": "send", "params": {"email_to": "a@b.com"}},
+        {"tool": "github", "action": "list", "params": {"limit": 5}},
+    ]))
+
+    assert handlers[-1] == ("email", {"email_to": "a@b.com"}, ["--- BRAIN: {'shortcuts': ['bio']} ---\n"])
+    assert [r.split(":")[0] for r in result["results"]] == ["--- BRAIN", "--- EMAIL", "--- GITHUB"]
+
+def test_executor_skips_duplicate_calls(handlers):
+    """Test Case 3: Identical calls run once; param key order doesn't matter"""
+    result = executor_node(AgentState(query="q", plan=[
+        {"tool": "brain", "action": "search", "params": {"shortcuts": ["bio"], "keywords": []}},
+        {"tool": "github", "action": "list", "params": {"limit": 5}},
+        {"tool": "brain", "action": "search", "params": {"keywords": [], "shortcuts": ["bio"]}},
+        {"tool": "brain", "action": "search", "params": {"shortcuts": ["skills"]}},
+    ]))
+
+    assert sorted(name for name, _, _ in handlers) == ["brain", "brain", "github"]
+    assert len(result["results"]) == 3
@@ -0,0 +1,70 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from langchain_core.messages import SystemMessage, HumanMessage
+from chat import llm_cache
+
+MESSAGES = [SystemMessage(content="prompt"), HumanMessage(content="Who is Pamudu?")]
+
+def _runnable(schema_title: str) -> MagicMock:
+    runnable = MagicMock()
+    runnable.get_output_jsonschema.return_value = {"title": schema_title}
+    runnable.invoke.return_value = f"{schema_title} response"
+    return runnable
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    """A real on-disk cache for every namespace."""
+    from diskcache import Cache
+    with patch('chat.llm_cache.get_disk_cache', return_value=Cache(str(tmp_path))) as mock:
+        yield mock.return_value
+
+def test_cached_invoke_without_cache_always_invokes():
+    """Test Case 1: With caching off, every call reaches the runnable"""
+    runnable = _runnable("AgentPlan")
+
+    llm_cache.cached_invoke(runnable, MESSAGES, "planner", config={"tags": ["x"]})
+    llm_cache.cached_invoke(runnable, MESSAGES, "planner", config={"tags": ["x"]})
+
+    assert runnable.invoke.call_count == 2
+    runnable.invoke.assert_called_with(MESSAGES, config={"tags": ["x"]})
+
+def test_cached_invoke_hit(disk_cache):
+    """Test Case 2: The same model, schema and messages hit the cache"""
+    runnable = _runnable("AgentPlan")
+
+    first = llm_cache.cached_invoke(runnable, MESSAGES, "planner")
+    second = llm_cache.cached_invoke(runnable, MESSAGES, "planner")
+
+    assert first == second == "AgentPlan response"
+    runnable.invoke.assert_called_once()
+
+def test_cached_invoke_key_covers_schema_model_and_version(disk_cache, monkeypatch):
+    """Test Case 3: A different output schema, model or cache version misses"""
+    llm_cache.cached_invoke(_runnable("AgentPlan"), MESSAGES, "planner")
+
+    other_schema = _runnable("AgentPlanV2")
+    llm_cache.cached_invoke(other_schema, MESSAGES, "planner")
+    other_schema.invoke.assert_called_once()
+
+    monkeypatch.setattr(llm_cache, "MODEL_NAME", "other-model")
+    other_model = _runnable("AgentPlan")
+    llm_cache.cached_invoke(other_model, MESSAGES, "planner")
+    other_model.invoke.assert_called_once()
+
+    monkeypatch.setattr(llm_cache, "CACHE_VERSION", llm_cache.CACHE_VERSION + 1)
+    other_version = _runnable("AgentPlan")
+    llm_cache.cached_invoke(other_version, MESSAGES, "planner")
+    other_version.invoke.assert_called_once()
+
+def test_cached_invoke_fails_open():
+    """Test Case 4: Cache read and write errors fall back to a plain invoke"""
+    broken = MagicMock()
+    broken.get.side_effect = OSError("disk full")
+    broken.set.side_effect = OSError("disk full")
+    runnable = _runnable("AgentPlan")
+
+    with patch('chat.llm_cache.get_disk_cache', return_value=broken):
+        result = llm_cache.cached_invoke(runnable, MESSAGES, "planner")
+
+    assert result == "AgentPlan response"
+    runnable.invoke.assert_called_once()
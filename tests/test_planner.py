@@ -2,9 +2,11 @@ import pytest
 from unittest.mock import MagicMock, patch
 from chat import planner_node, AgentState, AgentPlan, ToolCall, SearchParams, EmailParams
 
-@pytest.fixture
-def mock_planner_llm():
-    with patch('chat.nodes.planner.get_llm') as mock_get_llm:
+@pytest.fixture(scope="module")
+def _patched_planner_llm():
+    # Patched once for the module; mock_planner_llm resets it per test
+    with patch('chat.nodes.planner.get_llm') as mock_get_llm, \
+         patch('chat.nodes.planner._PLANNER_LLM', None):
         mock_model = MagicMock()
         mock_get_llm.return_value = mock_model
         
@@ -13,6 +15,11 @@ def mock_planner_llm():
         
         yield mock_structured_llm
 
+@pytest.fixture
+def mock_planner_llm(_patched_planner_llm):
+    _patched_planner_llm.reset_mock(return_value=True, side_effect=True)
+    return _patched_planner_llm
+
 def test_planner_brain_tool(mock_planner_llm):
     """Test Case 1: Who is Pamudu? -> Brain tool"""
     # Setup mock response
@@ -23,7 +30,7 @@ def test_planner_brain_tool(mock_planner_llm):
     mock_planner_llm.invoke.return_value = mock_plan
     
     # Run planner
-    state = AgentState(query="Who is Pamudu?", conversation_history=[], plan=[], results=[], final_answer="", citations=[])
+    state = AgentState(query="Who is Pamudu?")
     result = planner_node(state)
     
     print(f"\nQuery: 'Who is Pamudu?'\nPlan: {result['plan']}")
@@ -41,7 +48,7 @@ def test_planner_github_tool(mock_planner_llm):
     )
     mock_planner_llm.invoke.return_value = mock_plan
     
-    state = AgentState(query="Show me your repos", conversation_history=[], plan=[], results=[], final_answer="", citations=[])
+    state = AgentState(query="Show me your repos")
     result = planner_node(state)
     
     print(f"\nQuery: 'Show me your repos'\nPlan: {result['plan']}")
@@ -50,18 +57,20 @@ def test_planner_github_tool(mock_planner_llm):
     assert result["plan"][0]["tool"] == "github"
 
 def test_planner_greeting(mock_planner_llm):
-    """Test Case 3: Hi -> No tools"""
+    """Test Case 3: Conversational greeting -> No tools"""
     mock_plan = AgentPlan(
         need_external_info=False,
         response="Hi there! I'm Pamudu's AI Assistant."
     )
     mock_planner_llm.invoke.return_value = mock_plan
     
-    state = AgentState(query="Hi", conversation_history=[], plan=[], results=[], final_answer="", citations=[])
+    # Longer than a bare greeting, so the LLM decides rather than the fast path
+    state = AgentState(query="Hi, how are you doing today?")
     result = planner_node(state)
     
-    print(f"\nQuery: 'Hi'\nAnswer: {result['final_answer']}")
+    print(f"\nQuery: 'Hi, how are you doing today?'\nAnswer: {result['final_answer']}")
 
+    mock_planner_llm.invoke.assert_called_once()
     assert result["plan"] == []
     assert "Hi there" in result["final_answer"]
 
@@ -73,11 +82,13 @@ def test_planner_irrelevant(mock_planner_llm):
     )
     mock_planner_llm.invoke.return_value = mock_plan
     
-    state = AgentState(query="What is the weather in Mars?", conversation_history=[], plan=[], results=[], final_answer="", citations=[])
+    # Not one of the fast-path question forms, so the LLM refuses it
+    state = AgentState(query="Who won the football world cup?")
     result = planner_node(state)
     
-    print(f"\nQuery: 'What is the weather in Mars?'\nAnswer: {result['final_answer']}")
+    print(f"\nQuery: 'Who won the football world cup?'\nAnswer: {result['final_answer']}")
 
+    mock_planner_llm.invoke.assert_called_once()
     assert result["plan"] == []
     assert "only help with questions about Pamudu" in result["final_answer"]
 
@@ -91,7 +102,7 @@ def test_planner_email_workflow(mock_planner_llm):
     )
     mock_planner_llm.invoke.return_value = mock_plan_draft
     
-    state1 = AgentState(query="Send an email to Bob saying Hi", conversation_history=[], plan=[], results=[], final_answer="", citations=[])
+    state1 = AgentState(query="Send an email to Bob saying Hi")
     result1 = planner_node(state1)
     
     print(f"\nQuery (Turn 1): 'Send an email...'\nAnswer: {result1['final_answer']}")
@@ -110,7 +121,7 @@ def test_planner_email_workflow(mock_planner_llm):
         {"role": "user", "content": "Send an email to Bob saying Hi"},
         {"role": "assistant", "content": "Here is the draft..."}
     ]
-    state2 = AgentState(query="Yes, send it", conversation_history=history, plan=[], results=[], final_answer="", citations=[])
+    state2 = AgentState(query="Yes, send it", conversation_history=history)
     result2 = planner_node(state2)
     
     print(f"\nQuery (Turn 2): 'Yes, send it'\nPlan: {result2['plan']}")
@@ -118,3 +129,99 @@ def test_planner_email_workflow(mock_planner_llm):
     assert len(result2["plan"]) == 1
     assert result2["plan"][0]["tool"] == "email"
     assert result2["plan"][0]["action"] == "send"
+
+def test_planner_routes_single_tool_prompt(mock_planner_llm):
+    """Test Case 6: Single-tool query -> narrowed planner prompt"""
+    mock_plan = AgentPlan(
+        need_external_info=True,
+        tool_calls=[ToolCall(tool="youtube", action="list", params=SearchParams(limit=5))]
+    )
+    mock_planner_llm.invoke.return_value = mock_plan
+    
+    state = AgentState(query="Any new videos?")
+    planner_node(state)
+    
+    system_prompt = mock_planner_llm.invoke.call_args[0][0][0].content
+    assert "YOUTUBE TOOL" in system_prompt
+    assert "GITHUB TOOL" not in system_prompt
+
+def test_planner_fast_intent_skips_llm(mock_planner_llm):
+    """Test Case 7: Greetings and off-topic queries -> canned answer, no LLM call"""
+    for query, expected in [
+        ("Hello!", "Hi there"),
+        ("What is the capital of France?", "only help with questions about Pamudu"),
+        ("What's the weather in Mars?", "only help with questions about Pamudu"),
+        ("Who is the president of the USA?", "only help with questions about Pamudu"),
+    ]:
+        state = AgentState(query=query)
+        result = planner_node(state)
+
+        assert result["plan"] == []
+        assert expected in result["final_answer"]
+
+    mock_planner_llm.invoke.assert_not_called()
+
+def test_planner_fast_intent_keeps_project_questions(mock_planner_llm):
+    """Test Case 8: Project names containing off-topic words still reach the LLM"""
+    mock_planner_llm.invoke.return_value = AgentPlan(
+        need_external_info=True,
+        tool_calls=[ToolCall(tool="github", action="search", params=SearchParams(keywords=["forecast"]))]
+    )
+    
+    for query in [
+        "Show me the stock price prediction repo",
+        "Any weather forecasting projects?",
+        "Tell me about the exchange rate predictor project",
+    ]:
+        result = planner_node(AgentState(query=query))
+        assert result["plan"][0]["tool"] == "github"
+    
+    assert mock_planner_llm.invoke.call_count == 3
+
+def test_planner_follow_up_keeps_full_prompt(mock_planner_llm):
+    """Test Case 9: Follow-up turn in an email flow -> full prompt, not routed"""
+    mock_planner_llm.invoke.return_value = AgentPlan(
+        need_external_info=False,
+        response="Here is the draft..."
+    )
+    
+    history = [
+        {"role": "user", "content": "Send an email to Bob"},
+        {"role": "assistant", "content": "What's Bob's email address and what should the subject and body be?"}
+    ]
+    # "code" alone would route to the GitHub-only prompt
+    state = AgentState(query="To bob@x.com, subject Intro, body: tell him about the code", conversation_history=history)
+    planner_node(state)
+    
+    system_prompt = mock_planner_llm.invoke.call_args[0][0][0].content
+    assert "EMAIL TOOL" in system_prompt
+    assert "CRITICAL PROTOCOL" in system_prompt
+
+def test_planner_contact_questions_not_routed_to_email(mock_planner_llm):
+    """Test Case 10: Asking for an email address is a contact question, not a send"""
+    mock_planner_llm.invoke.return_value = AgentPlan(
+        need_external_info=True,
+        tool_calls=[ToolCall(tool="brain", action="search", params=SearchParams(shortcuts=["bio"]))]
+    )
+    
+    for query in ["What is Pamudu's email address?", "How can I contact him by email?"]:
+        planner_node(AgentState(query=query))
+        
+        system_prompt = mock_planner_llm.invoke.call_args[0][0][0].content
+        assert "BRAIN TOOL" in system_prompt
+        assert "You have access to 5 TOOLS" in system_prompt
+
+def test_planner_routed_prompt_only_has_its_rules(mock_planner_llm):
+    """Test Case 11: A routed prompt drops the other tools' rules and examples"""
+    mock_planner_llm.invoke.return_value = AgentPlan(need_external_info=False, response="...")
+    
+    planner_node(AgentState(query="Any new videos?"))
+    system_prompt = mock_planner_llm.invoke.call_args[0][0][0].content
+    assert "use YOUTUBE tool" in system_prompt
+    for other in ["EMAIL", "GITHUB", "BRAIN", "MEDIUM", "MULTI TOOL"]:
+        assert other not in system_prompt
+    
+    planner_node(AgentState(query="Send an email to Bob"))
+    system_prompt = mock_planner_llm.invoke.call_args[0][0][0].content
+    assert "EMAIL SAFETY" in system_prompt
+    assert "The draft looks good. Send it." in system_prompt
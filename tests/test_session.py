@@ -0,0 +1,50 @@
+import pytest
+from unittest.mock import patch
+from chat import ChatSession
+from chat.session import HISTORY_WINDOW_TURNS
+
+@pytest.fixture
+def mock_app():
+    with patch('chat.session.app') as mock:
+        mock.invoke.side_effect = lambda inputs: {"final_answer": f"answer to {inputs['query']}"}
+        yield mock
+
+def test_session_keeps_recent_window_and_summary(mock_app):
+    """Test Case 1: Older turns fold into one summary message ahead of the window"""
+    session = ChatSession()
+    turns = HISTORY_WINDOW_TURNS + 2
+    for i in range(turns):
+        session.chat(f"question {i}")
+
+    history = session.conversation_history
+    assert session.turn_count == turns
+    assert len(history) == 1 + HISTORY_WINDOW_TURNS * 2
+    assert history[0]["role"] == "system"
+    assert "2 turns" in history[0]["content"]
+    assert "question 0; question 1" in history[0]["content"]
+    assert history[1] == {"role": "user", "content": "question 2"}
+    assert history[-1] == {"role": "assistant", "content": f"answer to question {turns - 1}"}
+
+    # The graph sees the history from before the current turn
+    last_inputs = mock_app.invoke.call_args[0][0]
+    assert last_inputs["conversation_history"][-1] == {"role": "assistant", "content": f"answer to question {turns - 2}"}
+
+def test_session_history_setter_compacts_stored_messages(mock_app):
+    """Test Case 2: Loaded history keeps role/content only and is windowed like live turns"""
+    stored = []
+    for i in range(HISTORY_WINDOW_TURNS + 1):
+        stored.append({"role": "user", "content": f"q{i}", "timestamp": i})
+        stored.append({"role": "assistant", "content": f"a{i}", "timestamp": i})
+
+    session = ChatSession()
+    session.conversation_history = [{"role": "system", "content": "stale summary"}] + stored
+
+    history = session.conversation_history
+    assert session.turn_count == HISTORY_WINDOW_TURNS + 1
+    assert history[0] == {"role": "system", "content": "…earlier: 1 turns about q0"}
+    assert history[1] == {"role": "user", "content": "q1"}
+    assert all(set(m) == {"role", "content"} for m in history)
+
+    session.clear_history()
+    assert session.conversation_history == []
+    assert session.turn_count == 0
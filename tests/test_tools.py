@@ -1,41 +1,191 @@
 import pytest
 from unittest.mock import MagicMock, patch
-from tools import github_tools
+from tools import cache, feeds, github_tools, medium_tools, rate_limit, youtube_tools
 
-@pytest.fixture
-def mock_github():
-    with patch('tools.github_tools.Github') as mock:
-        yield mock
-
-def test_list_my_repos(mock_github):
+def test_list_my_repos(patched_github):
     # Setup mock
-    mock_instance = mock_github.return_value
-    mock_user = mock_instance.get_user.return_value
+    mock_instance = patched_github.return_value
     
-    # Create mock repos
-    repo1 = MagicMock()
-    repo1.name = "repo1"
-    repo1.description = "desc1"
-    repo1.language = "Python"
-    repo1.stargazers_count = 10
-    repo1.updated_at = "2023-01-01"
-    repo1.html_url = "http://github.com/user/repo1"
+    # Create mock GraphQL response
+    repo1 = {
+        "name": "repo1",
+        "description": "desc1",
+        "primaryLanguage": {"name": "Python"},
+        "stargazerCount": 10,
+        "updatedAt": "2023-01-01T00:00:00Z",
+        "url": "http://github.com/user/repo1"
+    }
     
-    mock_user.get_repos.return_value = [repo1]
+    mock_instance.requester.graphql_query.return_value = (
+        {}, {"data": {"user": {"repositories": {"nodes": [repo1]}}}}
+    )
     
     # Run function
-    # We need to ensure _github_client is reset or mocked continuously because of the singleton pattern in the tool
-    # But since we patch the class `Github`, the `_get_github` function will instantiate our mock.
-    # However, `_github_client` global variable might persist.
-    # Let's reset it before test.
-    github_tools._github_client = None
-    
-    # Ensure environment variable is mocked if needed, or handle the raises
-    with patch.dict(os.environ, {"GITHUB_TOKEN": "fake_token"}):
-        results = github_tools.list_my_repos(limit=1)
+    results = github_tools.list_my_repos(limit=1)
     
     assert len(results) == 1
     assert results[0]['name'] == "repo1"
     assert results[0]['language'] == "Python"
 
-import os
+# Trimmed copy of the Medium RSS shape: no <description>, body in content:encoded
+MEDIUM_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss xmlns:content="http://purl.org/rss/1.0/modules/content/" version="2.0"><channel>
+<title><![CDATA[Stories by Pamudu on Medium]]></title>
+<item><title><![CDATA[Building AI Agents]]></title><link>https://medium.com/@pamudu1111/agents-1</link>
+<pubDate>Mon, 01 Jan 2024 10:00:00 GMT</pubDate><content:encoded><![CDATA[<p>LangGraph agents</p>]]></content:encoded></item>
+<item><title><![CDATA[Robotics Notes]]></title><link>https://medium.com/@pamudu1111/robots-2</link>
+<pubDate>Tue, 02 Jan 2024 10:00:00 GMT</pubDate><content:encoded><![CDATA[<p>ROS and sensors</p>]]></content:encoded></item>
+</channel></rss>"""
+
+@pytest.fixture
+def medium_feed():
+    """Serve MEDIUM_FEED for any feed fetch, with an empty feed cache."""
+    response = MagicMock()
+    response.__enter__.return_value.read.return_value = MEDIUM_FEED
+    response.__enter__.return_value.headers = {}
+    with patch('urllib.request.urlopen', return_value=response) as mock, \
+         patch.dict(feeds._FEEDS, clear=True):
+        yield mock
+
+def test_list_medium_articles(medium_feed):
+    results = medium_tools.list_medium_articles(limit=1)
+    
+    assert results == [{
+        "title": "Building AI Agents",
+        "date": "Mon, 01 Jan 2024 10:00:00 GMT",
+        "link": "https://medium.com/@pamudu1111/agents-1",
+        "preview": "<p>LangGraph agents</p>"
+    }]
+
+def test_search_medium_articles_shares_feed(medium_feed):
+    medium_tools.list_medium_articles()
+    results = medium_tools.search_medium_articles(["ros"])
+    
+    assert [r['title'] for r in results] == ["Robotics Notes"]
+    assert results[0]['matches'] == ["content:ros"]
+    # The search reuses the feed fetched by the listing
+    assert medium_feed.call_count == 1
+
+def test_parse_entries_does_not_expand_entities(tmp_path):
+    secret = tmp_path / "secret.txt"
+    secret.write_text("TOP-SECRET")
+    body = f"""<?xml version="1.0"?>
+<!DOCTYPE rss [<!ENTITY x "EXPANDED"><!ENTITY ext SYSTEM "{secret.as_uri()}">]>
+<rss><channel><item><title>a&x;</title><description>&ext;</description></item></channel></rss>""".encode()
+    
+    entries = feeds._parse_entries(body)
+    
+    assert "EXPANDED" not in entries[0]["title"]
+    assert "TOP-SECRET" not in entries[0]["summary"]
+
+def _mock_repo(patched_github):
+    repo = patched_github.return_value.get_user.return_value.get_repo.return_value
+    repo.default_branch = "main"
+    repo.html_url = "https://github.com/pamudu123/repo1"
+    return patched_github.return_value.requester
+
+def test_get_file_content_quotes_path(patched_github):
+    requester = _mock_repo(patched_github)
+    requester.requestJson.return_value = (200, {"content-type": "text/plain; charset=utf-8"}, "notes")
+    
+    result = github_tools.get_file_content("repo1", "docs/my notes#1.md")
+    
+    url = requester.requestJson.call_args[0][1]
+    assert url == "/repos/pamudu123/repo1/contents/docs/my%20notes%231.md"
+    assert result['content'] == "notes"
+    assert result['filename'] == "my notes#1.md"
+
+def test_get_file_content_rejects_directory(patched_github):
+    requester = _mock_repo(patched_github)
+    requester.requestJson.return_value = (200, {"content-type": "application/json; charset=utf-8"}, '[{"name": "a.py"}]')
+    
+    result = github_tools.get_file_content("repo1", "src")
+    
+    assert "not a file" in result['error']
+
+def test_get_file_content_unfollowed_redirect(patched_github):
+    requester = _mock_repo(patched_github)
+    requester.requestJson.return_value = (307, {}, "")
+    
+    result = github_tools.get_file_content("repo1", "README.md")
+    
+    assert "HTTP 307" in result['error']
+
+def test_ttl_cache_positional_and_keyword_share_entry():
+    calls = []
+
+    @cache.ttl_cache(60)
+    def fetch(repo_name, limit=5):
+        calls.append(repo_name)
+        return {"repo": repo_name, "limit": limit}
+    
+    fetch("repo1")
+    fetch(repo_name="repo1")
+    fetch("repo1", 5)
+    
+    assert calls == ["repo1"]
+
+def test_disk_cache_positional_and_keyword_share_entry(tmp_path):
+    from diskcache import Cache
+    calls = []
+
+    @cache.disk_cache("test", expire=60)
+    def fetch(video_id):
+        calls.append(video_id)
+        return [{"text": video_id}]
+    
+    with patch('tools.cache.get_disk_cache', return_value=Cache(str(tmp_path))):
+        fetch("abc")
+        fetch(video_id="abc")
+    
+    assert calls == ["abc"]
+
+@pytest.fixture
+def test_limiter():
+    """A fresh limiter registered as the "test" API."""
+    limiter = rate_limit.AdaptiveLimiter("test", initial=2, maximum=4)
+    with patch.dict(rate_limit.TOOL_LIMITERS, {"test": limiter}):
+        yield limiter
+
+def test_rate_limited_records_requests_not_cache_hits(test_limiter):
+    @cache.ttl_cache(60)
+    @rate_limit.rate_limited("test")
+    def fetch(name):
+        return {"error": "HTTP 429"} if name == "busy" else {"name": name}
+    
+    with patch.object(test_limiter, 'record', wraps=test_limiter.record) as record:
+        fetch("a")
+        fetch("a")
+        fetch("busy")
+    
+    # One clean request, one throttled; the cache hit is not a request
+    assert [c.args for c in record.call_args_list] == [(False,), (True,)]
+    assert test_limiter.limit == 1
+
+def test_transcript_fan_out_takes_a_permit_per_fetch(monkeypatch):
+    import threading
+    import time
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def fetch(video_id):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return {"video_id": video_id, "transcript": "talk about ros"}
+    
+    monkeypatch.setattr(rate_limit.TOOL_LIMITERS["youtube"], "_limit", 1.0)
+    monkeypatch.setattr(rate_limit.TOOL_LIMITERS["youtube"], "_max", 1)
+    videos = [{"title": v, "video_id": v, "link": v} for v in "abc"]
+    with patch.object(youtube_tools, 'list_youtube_videos', return_value=videos), \
+         patch('youtube_transcript_api.YouTubeTranscriptApi') as api, \
+         patch('youtube_transcript_api.formatters.TextFormatter') as formatter:
+        api.return_value.fetch.side_effect = fetch
+        formatter.return_value.format_transcript.return_value = "talk about ros"
+        results = youtube_tools.search_video_transcripts(["ros"])
+    
+    assert [r['video_id'] for r in results] == ["a", "b", "c"]
+    assert peak[0] == 1